@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data import OHLCV, INTRADAY, clean_ohlcv, fetch_start, get_provider, period_offset
+from ohlcv import Bars
+from profiling import frame_bytes, note
+
+# On-disk OHLCV store keyed by (symbol, interval). Each entry is a pair of .npy
+# arrays (int64 UTC nanoseconds + float64 OHLCV) that are memory-mapped on read,
+# plus a small JSON sidecar recording the covered time range. Reruns only fetch
+# the bars after the last stored one.
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "bars")
+
+# Seconds after a fetch during which an entry is served without asking upstream
+REFRESH_AFTER = {"1d": 300, "1wk": 900, "1mo": 3600}
+INTRADAY_REFRESH_AFTER = 30
+
+
+def refresh_after(interval) -> float:
+    """Seconds ``interval`` bars are served from the store before asking upstream again."""
+    return INTRADAY_REFRESH_AFTER if interval in INTRADAY else REFRESH_AFTER.get(interval, 300)
+
+
+class BarStore:
+    def __init__(self, root=None, provider=None):
+        self.root = root or os.environ.get("DASHBOARD_BAR_STORE", DEFAULT_ROOT)
+        self.provider = provider
+        self._lock = threading.Lock()
+
+    # ─── Paths / raw IO ──────────────────────────────────────────────────────────
+    def _dir(self, symbol, interval):
+        return os.path.join(self.root, interval, symbol.replace("/", "_"))
+
+    def _read(self, symbol, interval):
+        """Return (timestamps, values, meta) memory-mapped, or None if not cached."""
+        path = self._dir(symbol, interval)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            ts = np.load(os.path.join(path, "ts.npy"), mmap_mode="r")
+            values = np.load(os.path.join(path, "ohlcv.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return ts, values, meta
+
+    def _write(self, symbol, interval, ts, values, meta):
+        path = self._dir(symbol, interval)
+        os.makedirs(path, exist_ok=True)
+        # Write to temp files then rename so readers never see a partial entry
+        for name, arr in (("ts.npy", ts), ("ohlcv.npy", values)):
+            tmp = os.path.join(path, f".{name}.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(arr))
+            os.replace(tmp, os.path.join(path, name))
+        tmp = os.path.join(path, ".meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    @staticmethod
+    def _to_frame(ts, values, tz, lo=0):
+        # Copy the requested slice out so the mapping can be released (and replaced)
+        index = pd.DatetimeIndex(np.array(ts[lo:]), tz="UTC").tz_convert(tz)
+        return pd.DataFrame(np.array(values[lo:]), index=index, columns=OHLCV)
+
+    @staticmethod
+    def _from_frame(df):
+        df = clean_ohlcv(df).reindex(columns=OHLCV)
+        ts = df.index.as_unit("ns").asi8 if len(df) else np.empty(0, dtype=np.int64)
+        return ts.astype(np.int64), df.to_numpy(dtype=np.float64)
+
+    # ─── Public API ──────────────────────────────────────────────────────────────
+    def coverage(self, symbol, interval):
+        """Covered ``(start, end)`` timestamps for an entry, or None."""
+        entry = self._read(symbol, interval)
+        if entry is None:
+            return None
+        meta = entry[2]
+        return pd.Timestamp(meta["start"], tz="UTC"), pd.Timestamp(meta["end"], tz="UTC")
+
+    def get(self, symbols, period, interval) -> dict:
+        """Bars for ``period`` per symbol, fetching only what the store is missing.
+
+        Symbols whose stored range starts too late are refetched in full; the rest
+        only request the tail from their last stored bar (which may still have been
+        forming). If upstream fails, whatever is stored is returned.
+        """
+        return self._get(symbols, period, interval, self._to_frame, clean_ohlcv(None))
+
+    def get_bars(self, symbols, period, interval) -> dict:
+        """Like ``get`` but returns compact ``ohlcv.Bars`` (one float32 copy of the mapped arrays)."""
+        return self._get(symbols, period, interval, self._to_bars, Bars.empty_bars())
+
+    @staticmethod
+    def _to_bars(ts, values, tz, lo=0):
+        return Bars.from_arrays(ts[lo:], values[lo:], tz)
+
+    def _get(self, symbols, period, interval, convert, missing):
+        provider = self.provider or get_provider()
+        now = time.time()
+        # One spare session for day periods, so a holiday in the window is still covered
+        want = fetch_start(period)
+        want_ns = want.tz_convert("UTC").value
+        fresh_for = refresh_after(interval)
+
+        symbols, full, tails = list(dict.fromkeys(symbols)), [], {}
+        for symbol in symbols:
+            entry = self._read(symbol, interval)
+            if entry is None or entry[2]["start"] > want_ns:
+                full.append(symbol)
+            elif now - entry[2]["fetched_at"] >= fresh_for:
+                tails.setdefault(entry[2]["end"], []).append(symbol)
+            del entry
+
+        fetched = {}
+        try:
+            if full:
+                fetched.update(provider.history(full, period=period, interval=interval))
+            # Symbols sharing a last bar are fetched together in one bulk request
+            for last, group in tails.items():
+                start = pd.Timestamp(last, tz="UTC").tz_convert(want.tz)
+                fetched.update(provider.history(group, interval=interval, start=start))
+        except Exception:
+            pass
+        note(bytes=frame_bytes(fetched), hits=len(symbols) - len(full) - sum(map(len, tails.values())),
+             misses=len(full) + sum(map(len, tails.values())))
+
+        out = {}
+        with self._lock:
+            for symbol in symbols:
+                if symbol in fetched:
+                    self._merge(symbol, interval, fetched[symbol], want_ns, now, symbol in full)
+                entry = self._read(symbol, interval)
+                if entry is None:
+                    out[symbol] = missing
+                    continue
+                ts, values, meta = entry
+                # Day periods keep the last N sessions present, like yfinance
+                out[symbol] = convert(ts, values, meta["tz"], period_offset(ts, period))
+        return out
+
+    def _merge(self, symbol, interval, new, want_ns, now, replace):
+        new_ts, new_values = self._from_frame(new)
+        entry = None if replace else self._read(symbol, interval)
+        if entry is None:
+            if not len(new_ts):
+                return
+            ts, values, start = new_ts, new_values, min(want_ns, int(new_ts[0]))
+            tz = str(new.index.tz or "UTC")
+        else:
+            old_ts, old_values, meta = entry
+            # New bars replace anything from the first refetched timestamp onward
+            keep = int(np.searchsorted(old_ts, new_ts[0])) if len(new_ts) else len(old_ts)
+            ts = np.concatenate([old_ts[:keep], new_ts])
+            values = np.concatenate([old_values[:keep], new_values])
+            start, tz = meta["start"], meta["tz"]
+            # Release the mappings before the files are replaced
+            del entry, old_ts, old_values
+        meta = {"start": start, "end": int(ts[-1]) if len(ts) else start, "tz": tz, "fetched_at": now}
+        self._write(symbol, interval, ts, values, meta)
+
+    def clear(self, symbol=None, interval=None):
+        """Drop stored entries (all, one interval, or one symbol/interval)."""
+        with self._lock:
+            if symbol and interval:
+                shutil.rmtree(self._dir(symbol, interval), ignore_errors=True)
+            elif interval:
+                shutil.rmtree(os.path.join(self.root, interval), ignore_errors=True)
+            else:
+                shutil.rmtree(self.root, ignore_errors=True)
+
+
+_store = None
+
+
+def get_bar_store() -> BarStore:
+    """Process-wide bar store shared by every session."""
+    global _store
+    if _store is None:
+        _store = BarStore()
+    return _store
@@ -0,0 +1,294 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from decimate import decimate_chart
+from profiling import get_profiler, note, record, stage
+from render_cache import chart_key, get_render_cache
+from streaming_indicators import incremental_indicators
+
+# Chart building shared by the Charting page. Overlays are described as plain
+# data (arrays, colors, labels) so the mplfinance render can run in a worker
+# process and come back as PNG bytes.
+
+# ─── Color palettes for moving averages ─────────────────────────────────────────
+sma_colors = ["#00ff9f", "#ff1744", "#f8f8f2", "#ff3636", "#8be9fd", "#33ffcc", "#ff6699", "#dddddd", "#ffaa00", "#9999ff"]
+ema_colors = ["#ff79c6", "#bd93f9", "#50fa7b", "#ffb86c", "#ff5555", "#66ff66", "#ff3333", "#66ccff", "#ffcc00", "#ff66ff"]
+hma_colors = ["#ff00ff", "#00ffff", "#ff8800", "#ff4444", "#ccff00", "#00cccc", "#cc0066", "#ffcc99", "#66ffcc", "#ccff33"]
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# ─── Compute stage ──────────────────────────────────────────────────────────────
+def build_overlays(tkr, per, intr, bars, opts, sma_list, ema_list, hma_list):
+    """Indicator lines for one chart (``ohlcv.Bars``) as ``(overlays, legend)``.
+
+    ``overlays`` is a list of ``(values, color, linestyle)`` and ``legend`` a list of
+    ``(label, color, linestyle)``; both pickle cheaply. Values are views into one
+    private copy of the indicator rows, taken while the shared state was locked.
+    """
+    overlays, legend = [], []
+    # Seeded once per (ticker, period, interval, params), then advanced only by the new bars
+    ind = incremental_indicators((tkr, per, intr), bars.ts, bars.close, sma=sma_list, ema=ema_list, hma=hma_list,
+                                 bb_window=opts.get("bb_window", 20) if opts.get("bollinger") else None,
+                                 bb_std=opts.get("bb_std", 2), sr_window=30 if opts.get("support_resistance") else None)
+    for kind, plist, colors in (("SMA", sma_list, sma_colors), ("EMA", ema_list, ema_colors), ("HMA", hma_list, hma_colors)):
+        for idx, p in enumerate(plist):
+            c = colors[idx % len(colors)]
+            if np.isnan(ind[kind.lower()][idx]).all(): continue  # period longer than the history
+            overlays.append((ind[kind.lower()][idx], c, "-")); legend.append((f"{kind}({p})", c, "-"))
+    # All-NaN lines (window longer than the history) make mplfinance raise, so they're skipped
+    if opts.get("bollinger") and not np.isnan(ind["bollinger"][1]).all():
+        ub, ma, lb = ind["bollinger"]
+        overlays.extend([(ub, "purple", "--"), (ma, "grey", "--"), (lb, "purple", "--")])
+        legend.extend([("BB Upper/Lower", "purple", "--"), ("BB SMA", "grey", "--")])
+    if opts.get("support_resistance") and not np.isnan(ind["support_resistance"][:, -1]).any():
+        sup, res = ind["support_resistance"][:, -1]
+        # Zero-stride views; decimation only materializes the plotted points
+        overlays.extend([(np.broadcast_to(sup, len(bars)), "green", "--"), (np.broadcast_to(res, len(bars)), "red", "--")])
+        legend.extend([("Support", "green", "--"), ("Resistance", "red", "--")])
+    return overlays, legend
+
+
+def render_args(tkr, per, intr, bars, opts, sma_list, ema_list, hma_list):
+    """``render_chart`` arguments: overlays at full resolution, then bars and lines decimated to the chart width."""
+    overlays, legend = build_overlays(tkr, per, intr, bars, opts, sma_list, ema_list, hma_list)
+    bars, overlays = decimate_chart(bars, overlays)
+    return bars, overlays, legend
+
+
+# ─── Styles ─────────────────────────────────────────────────────────────────────
+# matplotlib / mplfinance are imported on first use, never at module import, so
+# pages that don't draw charts start without them. Each style is built once per
+# process and shared by every render after that.
+STYLE_SPECS = {
+    "chart": {
+        "marketcolors": dict(up="#00ff9f", down="#ff1744", edge="#ffffff", wick="#aaaaaa", inherit=True),
+        "base_mpl_style": "dark_background",
+    },
+    "intraday": {
+        "marketcolors": dict(up="#00ff9f", down="#ff1744", edge="#ffffff", wick="#aaaaaa", volume="in", inherit=True),
+        "base_mpl_style": "dark_background", "gridcolor": "#444444", "gridstyle": "-", "facecolor": "000000",
+        "edgecolor": "000000", "figcolor": "black", "rc": {"grid.linewidth": 0.4},
+    },
+}
+_styles = {}
+_styles_lock = threading.Lock()
+
+
+def plotting():
+    """``(pyplot, mplfinance)``, importing them (with the Agg backend) on first call."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import mplfinance as mpf
+    return plt, mpf
+
+
+def get_style(name="chart"):
+    """mplfinance style from ``STYLE_SPECS``, built on first use."""
+    style = _styles.get(name)
+    if style is None:
+        _, mpf = plotting()
+        with _styles_lock:
+            if name not in _styles:
+                spec = dict(STYLE_SPECS[name])
+                spec["marketcolors"] = mpf.make_marketcolors(**spec["marketcolors"])
+                _styles[name] = mpf.make_mpf_style(**spec)
+            style = _styles[name]
+    return style
+
+
+def _warm_up():
+    for name in STYLE_SPECS:
+        get_style(name)
+
+
+# ─── Render stage ───────────────────────────────────────────────────────────────
+def render_chart(bars, overlays, legend) -> bytes:
+    """Candles + volume + overlays rendered to PNG bytes (safe to run in a worker process).
+
+    The DataFrame mplfinance needs is built here, from the already decimated bars.
+    """
+    from matplotlib.lines import Line2D
+
+    plt, mpf = plotting()
+    addplots = [mpf.make_addplot(v, color=c, linestyle=ls, width=0.5) for v, c, ls in overlays]
+    lines = [Line2D([0],[0], linewidth=0.5, color=c, linestyle=ls) for _, c, ls in legend]
+    fig, ax = mpf.plot(bars.to_frame(), type="candle", style=get_style("chart"), addplot=addplots, volume=True,
+                       returnfig=True)
+    if len(ax)>2:
+        for bar in ax[2].patches: bar.set_edgecolor("none")
+    ax[0].legend(lines, [lab for lab, _, _ in legend], loc='best', fontsize='small')
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def render_intraday(df, title) -> bytes:
+    """Home page intraday strip (candles only, "intraday" style) as PNG bytes."""
+    plt, mpf = plotting()
+    fig, _ = mpf.plot(df, type="candle", style=get_style("intraday"), title=title, returnfig=True)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _render_timed(bars, overlays, legend):
+    """``render_chart`` plus its wall time, so worker-process renders can be profiled."""
+    start = time.perf_counter()
+    png = render_chart(bars, overlays, legend)
+    return png, time.perf_counter() - start
+
+
+def cached_intraday(name, df) -> bytes:
+    """Intraday strip PNG from the shared render cache; matplotlib is only loaded on a miss."""
+    cache = get_render_cache()
+    key = chart_key(name, "intraday", df, {}, [], [], [])
+    png = cache.get(key)
+    if png is None:
+        note(misses=1)
+        png = render_intraday(df, f"{name} (15m)")
+        cache.put(key, png)
+    else:
+        note(hits=1)
+    return png
+
+
+def cached_chart(tkr, per, intr, bars, opts, sma_list, ema_list, hma_list) -> bytes:
+    """PNG for one chart, served from the shared render cache when its inputs are unchanged."""
+    cache = get_render_cache()
+    key = chart_key(tkr, intr, bars, opts, sma_list, ema_list, hma_list)
+    png = cache.get(key)
+    if png is not None:
+        record("render", tkr, hits=1)
+        return png
+    with stage("compute", tkr):
+        args = render_args(tkr, per, intr, bars, opts, sma_list, ema_list, hma_list)
+    with stage("render", tkr, misses=1):
+        png = render_chart(*args)
+    cache.put(key, png)
+    return png
+
+
+# ─── Concurrent watchlist pipeline ──────────────────────────────────────────────
+# One render pool per server process, sized DEFAULT_WORKERS; each stream_charts call
+# bounds its own in-flight renders to its ``workers`` with a semaphore.
+_render_pool_instance = None
+_render_pool_lock = threading.Lock()
+
+
+def _render_pool():
+    # Spawned (not forked) workers: the Streamlit server is multi-threaded
+    global _render_pool_instance
+    with _render_pool_lock:
+        if _render_pool_instance is None:
+            pool = ProcessPoolExecutor(DEFAULT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            # Start every worker now and let it import the plotting stack while bars are fetched
+            for _ in range(DEFAULT_WORKERS):
+                pool.submit(_warm_up)
+            _render_pool_instance = pool
+        return _render_pool_instance
+
+
+def _reset_render_pool(pool=None):
+    """Shut down the render pool (only if it is still ``pool``) so the next render starts a fresh one."""
+    global _render_pool_instance
+    with _render_pool_lock:
+        if _render_pool_instance is not None and pool in (None, _render_pool_instance):
+            _render_pool_instance.shutdown(wait=False, cancel_futures=True)
+            _render_pool_instance = None
+
+
+def stream_charts(tickers, per, intr, opts, sma_list, ema_list, hma_list, workers=DEFAULT_WORKERS, chunk_size=5,
+                  fetch=None):
+    """Yield ``(ticker, png_bytes or None)`` in watchlist order as each chart finishes.
+
+    Tickers are fetched in bulk chunks on a background thread, indicators are
+    computed as each chunk lands, and renders go to the shared process pool.
+    Charts whose inputs are unchanged come straight from the render cache.
+    ``workers`` caps this call's concurrent renders (the pool itself has
+    DEFAULT_WORKERS processes). Fetches run one after another (yfinance downloads
+    are serialized by ``YFinanceProvider``) but overlap compute and rendering.
+    ``fetch(chunk, per, intr)`` replaces the resample engine as the bar source.
+    """
+    from resample import get_resample_engine
+
+    fetch = fetch or get_resample_engine().get
+    cache = get_render_cache()
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    pool = _render_pool() if workers > 1 else None
+    slots = threading.BoundedSemaphore(max(1, workers))
+    pending = deque()  # (ticker, None | png | (future or None, pool, render args, key)) in watchlist order
+    context = get_profiler().context()
+    with ThreadPoolExecutor(1) as io_pool:
+        fetches = [io_pool.submit(_fetch_chunk, fetch, chunk, per, intr, context) for chunk in chunks]
+        for chunk, future in zip(chunks, fetches):
+            bars = future.result()
+            for tkr in chunk:
+                b = bars.get(tkr)
+                if b is None or b.empty:
+                    pending.append((tkr, None))
+                    continue
+                key = chart_key(tkr, intr, b, opts, sma_list, ema_list, hma_list)
+                png = cache.get(key)
+                if png is not None:
+                    record("render", tkr, hits=1)
+                    pending.append((tkr, png))
+                    continue
+                with stage("compute", tkr):
+                    args = render_args(tkr, per, intr, b, opts, sma_list, ema_list, hma_list)
+                pending.append((tkr, (_submit(pool, slots, args), pool, args, key)))
+            # Hand back finished charts in order while later chunks are still in flight
+            while pending and _ready(pending[0][1]):
+                yield _finish(*pending.popleft())
+    while pending:
+        yield _finish(*pending.popleft())
+
+
+def _submit(pool, slots, args):
+    if pool is None:
+        return None
+    slots.acquire()
+    try:
+        future = pool.submit(_render_timed, *args)
+    except (BrokenProcessPool, RuntimeError):
+        slots.release()
+        _reset_render_pool(pool)
+        return None
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def _fetch_chunk(fetch, chunk, per, intr, context):
+    with stage("fetch", ",".join(chunk), context=context):
+        return fetch(chunk, per, intr)
+
+
+def _ready(job):
+    return not isinstance(job, tuple) or job[0] is None or job[0].done()
+
+
+def _finish(tkr, job):
+    if not isinstance(job, tuple):
+        return tkr, job
+    future, pool, args, key = job
+    try:
+        png, seconds = future.result() if future is not None else _render_timed(*args)
+    except (BrokenProcessPool, CancelledError):
+        # A crashed worker poisons the pool: shut it down (unless another session already
+        # replaced it) and render inline. A pool shut down elsewhere cancels its futures.
+        _reset_render_pool(pool)
+        png, seconds = _render_timed(*args)
+    record("render", tkr, seconds, misses=1)
+    get_render_cache().put(key, png)
+    return tkr, png
@@ -0,0 +1,51 @@
+import numpy as np
+
+from ohlcv import Bars
+from resample import aggregate
+
+# OHLC-preserving downsampling applied right before plotting. Indicators are
+# computed on the full-resolution bars and then sampled at the same bucket
+# boundaries, so render cost depends on the chart width instead of the history.
+
+FIG_WIDTH_IN = 8      # mplfinance's default figure width
+DPI = 150             # matches render_chart's savefig dpi
+PX_PER_BAR = 3        # narrowest candle that still shows a body and wick
+
+
+def target_bars(width_px=FIG_WIDTH_IN * DPI, px_per_bar=PX_PER_BAR) -> int:
+    """Most candles that stay legible across ``width_px`` pixels."""
+    return max(int(width_px // px_per_bar), 10)
+
+
+def bucket_starts(n, target):
+    """Start offsets of ``ceil(n / target)``-bar buckets, or None if no reduction is needed."""
+    if n <= target:
+        return None
+    size = -(-n // target)
+    return np.arange(0, n, size)
+
+
+def decimate_ohlcv(bars: Bars, starts) -> Bars:
+    """Merge each bucket into one bar: first open, max high, min low, last close, summed volume.
+
+    Each merged bar keeps the timestamp of its first bar.
+    """
+    if starts is None:
+        return bars
+    return Bars(bars.ts[starts], aggregate(bars, starts), bars.tz)
+
+
+def decimate_line(values, starts):
+    """Sample a full-resolution overlay at each bucket's last bar (aligned with its close)."""
+    if starts is None:
+        return values
+    values = np.asarray(values)
+    return values[np.r_[starts[1:], len(values)] - 1]
+
+
+def decimate_chart(bars, overlays, target=None):
+    """Reduce ``bars`` and its ``(values, color, linestyle)`` overlays to about ``target`` bars."""
+    starts = bucket_starts(len(bars), target or target_bars())
+    if starts is None:
+        return bars, overlays
+    return decimate_ohlcv(bars, starts), [(decimate_line(v, starts), c, ls) for v, c, ls in overlays]
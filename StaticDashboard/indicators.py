@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Vectorized moving-average engine. Every function takes a 1-D array (or Series)
+# of closes and a list of periods, and returns a (len(periods), n) float64 array
+# with NaN where the window is not yet full, matching pandas rolling semantics.
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _wma_rows(rows: np.ndarray, periods) -> np.ndarray:
+    """Linearly weighted MA of each row of ``rows`` with its own period, in one pass."""
+    periods = np.asarray(periods, dtype=np.int64)
+    n_rows, n = rows.shape
+    if n_rows == 0 or n == 0:
+        return np.empty((n_rows, n))
+    width = int(periods.max())
+    # Right-aligned weights 1..p, zero-padded to the widest window
+    weights = np.zeros((n_rows, width))
+    for r, p in enumerate(periods):
+        weights[r, width - p:] = np.arange(1, p + 1) / (p * (p + 1) / 2)
+    nan = np.isnan(rows)
+    padded = np.concatenate([np.zeros((n_rows, width - 1)), np.where(nan, 0.0, rows)], axis=1)
+    out = np.einsum("rnw,rw->rn", sliding_window_view(padded, width, axis=1), weights)
+    # A window is valid once it is full and holds no NaN
+    nan_count = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(nan, axis=1)], axis=1)
+    idx = np.arange(n)
+    start = np.maximum(idx[None, :] + 1 - periods[:, None], 0)
+    window_nans = nan_count[:, 1:] - np.take_along_axis(nan_count, start, axis=1)
+    out[(idx[None, :] < periods[:, None] - 1) | (window_nans > 0)] = np.nan
+    return out
+
+
+def wma_matrix(values, periods) -> np.ndarray:
+    x = _as_array(values)
+    return _wma_rows(np.broadcast_to(x, (len(periods), len(x))), periods)
+
+
+def hma_matrix(values, periods) -> np.ndarray:
+    """Hull MA: WMA(2 * WMA(p/2) - WMA(p), sqrt(p)) for every period at once."""
+    periods = list(periods)
+    if not periods:
+        return np.empty((0, len(values)))
+    half = [int(p / 2) for p in periods]
+    sq = [int(np.sqrt(p)) for p in periods]
+    stacked = wma_matrix(values, half + periods)
+    diff = 2 * stacked[:len(periods)] - stacked[len(periods):]
+    return _wma_rows(diff, sq)
+
+
+def sma_matrix(values, periods) -> np.ndarray:
+    """Simple MAs from one cumulative sum (shifted by the first close to limit rounding)."""
+    x = _as_array(values)
+    n = len(x)
+    out = np.full((len(periods), n), np.nan)
+    if n == 0:
+        return out
+    csum = np.concatenate([[0.0], np.cumsum(x - x[0])])
+    for r, p in enumerate(periods):
+        if p <= n:
+            out[r, p - 1:] = (csum[p:] - csum[:-p]) / p + x[0]
+    return out
+
+
+def ema_matrix(values, periods) -> np.ndarray:
+    """EMAs with ``adjust=False`` (pandas' compiled recursion, one row per period)."""
+    x = pd.Series(_as_array(values))
+    out = np.empty((len(periods), len(x)))
+    for r, p in enumerate(periods):
+        out[r] = x.ewm(span=p, adjust=False).mean().to_numpy()
+    return out
+
+
+def bollinger(values, window=20, num_std=2.0):
+    """(upper, mid, lower) bands; mean and sample std come from the same window view."""
+    x = _as_array(values)
+    mid = np.full(len(x), np.nan)
+    std = np.full(len(x), np.nan)
+    if len(x) >= window:
+        windows = sliding_window_view(x, window)
+        mid[window - 1:] = windows.mean(axis=1)
+        std[window - 1:] = windows.std(axis=1, ddof=1)
+    return mid + num_std * std, mid, mid - num_std * std
+
+
+def compute_indicators(close, sma=(), ema=(), hma=(), bb_window=None, bb_std=2.0) -> dict:
+    """All selected overlays for one close series.
+
+    Returns ``{"sma": (len(sma), n), "ema": ..., "hma": ..., "bollinger": (3, n) or None}``.
+    """
+    x = _as_array(close)
+    out = {"sma": sma_matrix(x, sma), "ema": ema_matrix(x, ema), "hma": hma_matrix(x, hma),
+           "bollinger": None}
+    if bb_window:
+        out["bollinger"] = np.vstack(bollinger(x, bb_window, bb_std))
+    return out
+
+
+# ─── Series wrappers (same call shape as the old page helpers) ──────────────────
+def WMA(series, period):
+    return pd.Series(wma_matrix(series, [period])[0], index=series.index)
+
+
+def HMA(series, period):
+    return pd.Series(hma_matrix(series, [period])[0], index=series.index)
@@ -0,0 +1,247 @@
+import os
+import threading
+import zlib
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Shared market-data layer used by every page. Pages ask a provider for many
+# symbols at once instead of calling yfinance one ticker at a time.
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+
+# ─── Period / interval helpers ──────────────────────────────────────────────────
+PERIOD_DAYS = {"1d": 1, "2d": 2, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+               "1y": 366, "2y": 731, "5y": 1827, "10y": 3653}
+INTERVAL_FREQ = {"1m": "1min", "2m": "2min", "5m": "5min", "15m": "15min", "30m": "30min",
+                 "60m": "60min", "90m": "90min", "1h": "1h", "4h": "4h",
+                 "1d": "1D", "1wk": "W-FRI", "1mo": "MS"}
+INTRADAY = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h"}
+MARKET_TZ = "America/New_York"
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+
+
+def period_start(period: str, now=None) -> pd.Timestamp:
+    """Earliest timestamp a yfinance-style ``period`` string reaches back to.
+
+    Day periods ("1d", "2d", "5d") count sessions back from the latest one that has
+    opened, so before 9:30 and at weekends today does not count. Exchange holidays
+    are not modelled: use ``period_offset`` to cut day periods out of actual bars.
+    """
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else now.tz_convert(MARKET_TZ)
+    if period.endswith("d"):
+        today = now.normalize()
+        opened = now.dayofweek < 5 and now - today >= SESSION_OPEN
+        last_session = today if opened else pd.offsets.BDay().rollback(today - pd.Timedelta(days=1))
+        return last_session - pd.offsets.BDay(int(period[:-1]) - 1)
+    return (now - pd.Timedelta(days=PERIOD_DAYS[period])).normalize()
+
+
+def fetch_start(period: str, now=None) -> pd.Timestamp:
+    """``period_start`` with one spare session for day periods, for deciding what to fetch.
+
+    A holiday inside the window then still leaves N sessions in the fetched bars.
+    """
+    start = period_start(period, now)
+    return start - pd.offsets.BDay() if period.endswith("d") else start
+
+
+def period_offset(ts, period: str, now=None) -> int:
+    """Index of the first of ``ts`` (sorted int64 UTC nanoseconds) that falls inside ``period``.
+
+    Day periods keep the last N session dates present in the bars, which is how
+    yfinance counts them; longer periods cut at ``period_start``.
+    """
+    if not len(ts):
+        return 0
+    if not period.endswith("d"):
+        return int(np.searchsorted(ts, period_start(period, now).value))
+    days = pd.DatetimeIndex(np.asarray(ts), tz="UTC").tz_convert(MARKET_TZ).normalize().asi8
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    return int(starts[max(len(starts) - int(period[:-1]), 0)])
+
+
+def clean_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Flatten yfinance columns, keep OHLCV and drop bars without prices."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(1, axis=1)
+    df = df[[c for c in OHLCV if c in df.columns]]
+    return df.dropna(subset=["Open", "High", "Low", "Close"])
+
+
+# ─── Provider interface ─────────────────────────────────────────────────────────
+class MarketDataProvider:
+    """Base class. Subclasses implement ``history`` for one (period, interval)."""
+
+    name = "base"
+
+    def history(self, symbols, period=None, interval="1d", start=None) -> dict:
+        """Return ``{symbol: DataFrame}`` of OHLCV bars for every symbol in one request.
+
+        Either ``period`` (e.g. "5d") or ``start`` (a timestamp) bounds the request.
+        Symbols without data map to an empty DataFrame.
+        """
+        raise NotImplementedError
+
+    def fetch_many(self, requests) -> dict:
+        """Fetch a mix of ``(symbol, period, interval)`` requests.
+
+        Requests sharing a (period, interval) are grouped so each group is a single
+        bulk call. Returns ``{(symbol, period, interval): DataFrame}``.
+        """
+        groups = defaultdict(list)
+        for symbol, period, interval in requests:
+            if symbol not in groups[(period, interval)]:
+                groups[(period, interval)].append(symbol)
+        out = {}
+        for (period, interval), symbols in groups.items():
+            frames = self.history(symbols, period=period, interval=interval)
+            for symbol in symbols:
+                out[(symbol, period, interval)] = frames.get(symbol, clean_ohlcv(None))
+        return out
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data through a single ``yf.download`` call per (period, interval)."""
+
+    name = "yfinance"
+    # yf.download keeps its results in module-level state, so calls from several
+    # threads must not overlap (it already parallelizes symbols internally)
+    _lock = threading.Lock()
+
+    def history(self, symbols, period=None, interval="1d", start=None) -> dict:
+        import yfinance as yf
+
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        kwargs = {"start": start} if start is not None else {"period": period}
+        with self._lock:
+            raw = yf.download(symbols, interval=interval, group_by="ticker", auto_adjust=False,
+                              actions=False, threads=True, progress=False, **kwargs)
+        out = {}
+        for symbol in symbols:
+            if isinstance(raw.columns, pd.MultiIndex):
+                df = raw[symbol] if symbol in raw.columns.get_level_values(0) else None
+            else:
+                df = raw
+            out[symbol] = clean_ohlcv(df)
+        return out
+
+
+class FixtureProvider(MarketDataProvider):
+    """Offline provider for load tests and demos.
+
+    Reads ``<fixture_dir>/<SYMBOL>_<interval>.csv`` when present and otherwise
+    generates a deterministic random walk per symbol, so pages render without
+    network access.
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixture_dir=None, now=None):
+        self.fixture_dir = fixture_dir
+        self.now = now
+
+    def _load_csv(self, symbol, interval):
+        if not self.fixture_dir:
+            return None
+        path = os.path.join(self.fixture_dir, f"{symbol}_{interval}.csv")
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+
+    def _index(self, interval, start, end):
+        if interval in INTRADAY:
+            days = pd.bdate_range(start.normalize(), end.normalize(), tz=end.tz)
+            step = pd.Timedelta(INTERVAL_FREQ[interval])
+            offsets = np.arange(pd.Timedelta("9h30min").value, pd.Timedelta("16h").value, step.value)
+            stamps = (days.as_unit("ns").asi8[:, None] + offsets[None, :]).ravel()
+            idx = pd.DatetimeIndex(stamps, tz="UTC").tz_convert(end.tz)
+        else:
+            idx = pd.date_range(start.normalize(), end.normalize(), freq=INTERVAL_FREQ[interval], tz=end.tz)
+            if interval == "1d":
+                # Like the live feed, a session's daily bar appears once it has opened
+                idx = idx[(idx.dayofweek < 5) & (idx + SESSION_OPEN <= end)]
+        return idx[(idx >= start) & (idx <= end)]
+
+    @staticmethod
+    def _noise(seconds, seed):
+        # Cheap integer hash of (timestamp, seed) mapped to [-0.5, 0.5)
+        h = (seconds.astype(np.uint64) * np.uint64(2654435761) + np.uint64(seed)) % np.uint64(2**32)
+        h = (h ^ (h >> np.uint64(13))) * np.uint64(1274126177) % np.uint64(2**32)
+        return h / 2.0**32 - 0.5
+
+    def synthetic(self, symbol, interval, start, end) -> pd.DataFrame:
+        """Synthetic bars that are a pure function of (symbol, timestamp).
+
+        Overlapping requests therefore agree bar for bar, which keeps incremental
+        fetches consistent with full downloads.
+        """
+        idx = self._index(interval, start, end)
+        seed = zlib.crc32(symbol.encode())
+        rng = np.random.default_rng(seed)
+        base = 20 + rng.random() * 400
+        amp, freq, phase = rng.uniform(0.05, 0.3, 3), rng.uniform(0.01, 0.2, 3), rng.uniform(0, 6.3, 3)
+        secs = idx.as_unit("s").asi8
+        step = pd.Timedelta(INTERVAL_FREQ[interval]).total_seconds() if interval in INTRADAY else 86400
+
+        def price(s):
+            days = s / 86400.0
+            trend = (amp[:, None] * np.sin(freq[:, None] * days + phase[:, None])).sum(axis=0)
+            return base * np.exp(trend + 0.02 * self._noise(s, seed))
+
+        close, open_ = price(secs), price(secs - int(step))
+        spread = (0.5 + self._noise(secs, seed + 1)) * 0.01 * close
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread
+        volume = np.round(1e5 + (0.5 + self._noise(secs, seed + 2)) * 5e6)
+        return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close,
+                             "Volume": volume}, index=idx)
+
+    def history(self, symbols, period=None, interval="1d", start=None) -> dict:
+        now = self.now or pd.Timestamp.now(tz=MARKET_TZ)
+        by_period = start is None
+        start = fetch_start(period, now) if by_period else pd.Timestamp(start)
+        if start.tz is None:
+            start = start.tz_localize(now.tz)
+        out = {}
+        for symbol in dict.fromkeys(symbols):
+            df = self._load_csv(symbol, interval)
+            if df is None:
+                df = self.synthetic(symbol, interval, start - pd.Timedelta(days=1), now)
+            df = clean_ohlcv(df[(df.index >= start) & (df.index <= now)])
+            if by_period and len(df):
+                df = df.iloc[period_offset(df.index.as_unit("ns").asi8, period, now):]
+            out[symbol] = df
+        return out
+
+
+# ─── Provider selection ─────────────────────────────────────────────────────────
+PROVIDERS = {"yfinance": YFinanceProvider, "fixture": FixtureProvider}
+_provider = None
+
+
+def get_provider() -> MarketDataProvider:
+    """Process-wide provider chosen by ``DASHBOARD_PROVIDER`` (default ``yfinance``).
+
+    ``DASHBOARD_PROVIDER=fixture`` runs the dashboard offline; ``DASHBOARD_FIXTURES``
+    optionally points at a folder of recorded CSV bars.
+    """
+    global _provider
+    if _provider is None:
+        name = os.environ.get("DASHBOARD_PROVIDER", "yfinance").lower()
+        if name == "fixture":
+            _provider = FixtureProvider(os.environ.get("DASHBOARD_FIXTURES"))
+        else:
+            _provider = PROVIDERS[name]()
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider):
+    """Swap the process-wide provider (benchmarks and load tests)."""
+    global _provider
+    _provider = provider
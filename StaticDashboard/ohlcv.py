@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from market_data import OHLCV
+
+# Compact columnar OHLCV bars for the charting pipeline. Timestamps are int64
+# UTC nanoseconds and Open/High/Low/Close/Volume are rows of one float32 (5, n)
+# block, so each column is a contiguous view and a symbol costs 28 bytes per bar
+# (a float64 DataFrame with its index costs 48). Slices share memory with their
+# parent; a pandas frame is only built for the few hundred bars that get plotted.
+
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+
+class Bars:
+    __slots__ = ("ts", "values", "tz")
+
+    def __init__(self, ts, values, tz="UTC"):
+        self.ts = ts
+        self.values = values
+        self.tz = tz
+
+    # ─── Construction ────────────────────────────────────────────────────────────
+    @classmethod
+    def from_arrays(cls, ts, values, tz="UTC"):
+        """Bars from ``(n,)`` timestamps and row-major ``(n, 5)`` OHLCV values (one copy each)."""
+        ts = np.array(ts, dtype=np.int64)
+        block = np.empty((5, len(ts)), dtype=np.float32)
+        block[...] = np.asarray(values).T
+        return cls(ts, block, tz).freeze()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        if df is None or df.empty:
+            return cls.empty_bars()
+        values = df.reindex(columns=OHLCV).to_numpy(dtype=np.float32)
+        return cls.from_arrays(df.index.as_unit("ns").asi8, values, str(df.index.tz or "UTC"))
+
+    @classmethod
+    def empty_bars(cls, tz="UTC"):
+        return cls(np.empty(0, dtype=np.int64), np.empty((5, 0), dtype=np.float32), tz).freeze()
+
+    def freeze(self):
+        """Mark the arrays read-only so one instance can be shared by every session."""
+        self.ts.flags.writeable = False
+        self.values.flags.writeable = False
+        return self
+
+    # ─── Access ──────────────────────────────────────────────────────────────────
+    def __len__(self):
+        return len(self.ts)
+
+    @property
+    def empty(self):
+        return not len(self.ts)
+
+    @property
+    def open(self):
+        return self.values[OPEN]
+
+    @property
+    def high(self):
+        return self.values[HIGH]
+
+    @property
+    def low(self):
+        return self.values[LOW]
+
+    @property
+    def close(self):
+        return self.values[CLOSE]
+
+    @property
+    def volume(self):
+        return self.values[VOLUME]
+
+    @property
+    def nbytes(self):
+        return self.ts.nbytes + self.values.nbytes
+
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.ts, tz="UTC").tz_convert(self.tz)
+
+    def since(self, start) -> "Bars":
+        """View of the bars at or after ``start`` (a Timestamp or UTC nanoseconds)."""
+        start = start.value if isinstance(start, pd.Timestamp) else int(start)
+        lo = int(np.searchsorted(self.ts, start))
+        return self if lo == 0 else Bars(self.ts[lo:], self.values[:, lo:], self.tz)
+
+    def take(self, idx) -> "Bars":
+        return Bars(self.ts[idx], self.values[:, idx], self.tz)
+
+    def to_frame(self) -> pd.DataFrame:
+        """float64 DataFrame with a tz-aware index, as mplfinance expects."""
+        return pd.DataFrame(self.values.T.astype(np.float64), index=self.index(), columns=OHLCV)
@@ -0,0 +1,101 @@
+import time
+import streamlit as st
+from bar_store import REFRESH_AFTER
+from profiling import stage
+from screener import column_labels, fetch_universe, load_universe, parse_symbols, price_matrix, screen
+from watchlist_store import get_watchlist_store
+
+# ─── Moving average periods ───────────────────────────────────────────────────────
+allowed_periods = [5, 10, 20, 30, 40, 50, 60]
+
+# ─── Cached stages ─────────────────────────────────────────────────────────────────
+# The whole universe is fetched from the bar store once per (universe, period), in
+# chunks so other pages' fetches get the provider in between, and kept as one
+# read-only (time x symbol) close matrix shared by every session; indicator, filter
+# and sort changes only re-run the vectorized screen on it.
+@st.cache_resource(ttl=REFRESH_AFTER["1d"], max_entries=8, show_spinner="Loading universe...")
+def load_matrix(universe, period):
+    ts, symbols, close = price_matrix(fetch_universe(universe, period))
+    close.flags.writeable = False
+    return ts, symbols, close
+
+
+st.title("Screener")
+
+# ─── Sidebar: Universe ───────────────────────────────────────────────────────────────
+st.sidebar.header("Universe")
+file_universe = load_universe()
+sources = (["Universe file"] if file_universe else []) + ["All watchlists", "Custom list"]
+source = st.sidebar.selectbox("Symbols", sources)
+if source == "Universe file":
+    universe = file_universe
+elif source == "All watchlists":
+    universe = get_watchlist_store().symbols()
+else:
+    universe = parse_symbols(st.sidebar.text_area("Tickers (comma or newline separated)"))
+if not universe:
+    st.warning("No symbols to screen. Set DASHBOARD_UNIVERSE, create a watchlist or enter tickers.")
+    st.stop()
+period = st.sidebar.selectbox("History (daily bars)", ["6mo", "1y", "2y"], index=1)
+
+# ─── Sidebar: Indicators ─────────────────────────────────────────────────────────────
+st.sidebar.header("Indicators")
+sma_fast, sma_slow = st.sidebar.select_slider("SMA fast / slow", allowed_periods, value=(20, 50))
+ema_fast, ema_slow = st.sidebar.select_slider("EMA fast / slow", allowed_periods, value=(10, 30))
+bb_w = st.sidebar.selectbox("BB window", [5, 10, 20, 50], index=2)
+bb_s = st.sidebar.slider("BB stddev", 1.0, 3.0, 2.0, 0.1)
+lookback = st.sidebar.slider("Crossovers within (bars)", 1, 20, 5)
+change_bars = st.sidebar.selectbox("% change over (bars)", [5, 10, 20, 60], index=2)
+if sma_fast == sma_slow or ema_fast == ema_slow:
+    st.warning("Pick different fast and slow periods.")
+    st.stop()
+
+# ─── Screen ───────────────────────────────────────────────────────────────────────────
+with stage("fetch", f"{len(universe)} symbols"):
+    ts, symbols, close = load_matrix(tuple(universe), period)
+if not symbols:
+    st.warning("No data for the selected symbols.")
+    st.stop()
+start = time.perf_counter()
+with stage("compute", "screen"):
+    df = screen(close, symbols, sma=(sma_fast, sma_slow), ema=(ema_fast, ema_slow), bb_window=bb_w, bb_std=bb_s,
+                change_bars=change_bars, cross_lookback=lookback)
+elapsed = time.perf_counter() - start
+# Columns keep stable names so the chosen sort survives indicator changes; the
+# periods only appear in the displayed labels
+labels = column_labels((sma_fast, sma_slow), (ema_fast, ema_slow), change_bars)
+
+# ─── Filters / sort ─────────────────────────────────────────────────────────────────
+c1, c2, c3, c4 = st.columns(4)
+cross = c1.selectbox("Crossover", ["Any", "SMA bullish", "SMA bearish", "EMA bullish", "EMA bearish"])
+band = c2.selectbox("Bollinger", ["Any", "Below lower band", "Lower half", "Upper half", "Above upper band"])
+min_change = c3.number_input("Min % change (last bar)", value=None, step=0.5)
+max_change = c4.number_input("Max % change (last bar)", value=None, step=0.5)
+c1, c2, c3, c4 = st.columns(4)
+near_sup = c1.number_input("Within % of support", value=None, min_value=0.0, step=0.5)
+near_res = c2.number_input("Within % of resistance", value=None, min_value=0.0, step=0.5)
+sort_by = c3.selectbox("Sort by", list(df.columns), index=2, format_func=lambda c: labels.get(c, c))
+descending = c4.checkbox("Descending", value=True)
+
+with stage("compute", "filter"):
+    mask = df["Ticker"].notna()
+    if cross != "Any":
+        kind, direction = cross.split()
+        mask &= df[f"{kind} cross"] == direction.capitalize()
+    if band != "Any":
+        pct_b = df["Bollinger %B"]
+        mask &= {"Below lower band": pct_b < 0, "Lower half": (pct_b >= 0) & (pct_b < 0.5),
+                 "Upper half": (pct_b >= 0.5) & (pct_b <= 1), "Above upper band": pct_b > 1}[band]
+    if min_change is not None:
+        mask &= df["% Change"] >= min_change
+    if max_change is not None:
+        mask &= df["% Change"] <= max_change
+    if near_sup is not None:
+        mask &= df["Support %"] <= near_sup
+    if near_res is not None:
+        mask &= df["Resistance %"] <= near_res
+    view = df[mask].sort_values(sort_by, ascending=not descending, na_position="last")
+
+st.caption(f"{len(view)} of {len(symbols)} symbols · {len(close)} bars each · screened in {elapsed * 1e3:.0f} ms")
+with stage("render", "table"):
+    st.dataframe(view.round(2).rename(columns=labels), hide_index=True)
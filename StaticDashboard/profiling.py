@@ -0,0 +1,170 @@
+import csv
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# Per-stage timing for the dashboard pages. Pages wrap their fetch, compute and
+# render steps in ``stage``; the bar store and quote cache report hits, misses
+# and bytes received from upstream to whichever stage is open on the calling
+# thread. Records go to a bounded process-wide log (and, with
+# DASHBOARD_PROFILE_LOG, a JSON-lines file) that the debug panel summarizes.
+
+FIELDS = ["run", "page", "stage", "label", "start", "seconds", "bytes", "hits", "misses"]
+MAX_RECORDS = 10_000
+
+
+def frame_bytes(frames) -> int:
+    """In-memory size of a DataFrame or of every DataFrame in a dict."""
+    if frames is None:
+        return 0
+    if isinstance(frames, dict):
+        return sum(frame_bytes(df) for df in frames.values())
+    return int(frames.memory_usage(index=True).sum())
+
+
+class Profiler:
+    def __init__(self, max_records=MAX_RECORDS, log_path=None):
+        self.log_path = log_path
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ─── Recording ───────────────────────────────────────────────────────────────
+    def begin_run(self, page, run=None) -> str:
+        """Tag the stages recorded on this thread with ``page`` and a new run id."""
+        self._local.context = (run or uuid.uuid4().hex[:12], page)
+        return self._local.context[0]
+
+    def context(self):
+        """``(run, page)`` of this thread, to hand to stages run on worker threads."""
+        return getattr(self._local, "context", (None, None))
+
+    @contextmanager
+    def stage(self, stage, label="", context=None, **counts):
+        """Time the block as one ``stage`` record; yields the record so callers can add counts."""
+        run, page = context or self.context()
+        rec = {"run": run, "page": page, "stage": stage, "label": str(label), "start": time.time(),
+               "seconds": 0.0, "bytes": 0, "hits": 0, "misses": 0}
+        rec.update(counts)
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(rec)
+        start = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["seconds"] = time.perf_counter() - start
+            stack.pop()
+            self._add(rec)
+
+    def record(self, stage, label="", seconds=0.0, context=None, **counts):
+        """Add a record for work timed elsewhere (a worker process, a cache hit)."""
+        run, page = context or self.context()
+        rec = {"run": run, "page": page, "stage": stage, "label": str(label), "start": time.time() - seconds,
+               "seconds": seconds, "bytes": 0, "hits": 0, "misses": 0}
+        rec.update(counts)
+        self._add(rec)
+
+    def note(self, bytes=0, hits=0, misses=0):
+        """Add counts to the innermost stage open on this thread (no-op outside a stage)."""
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            rec = stack[-1]
+            rec["bytes"] += bytes
+            rec["hits"] += hits
+            rec["misses"] += misses
+
+    def _add(self, rec):
+        with self._lock:
+            self._records.append(rec)
+            if self.log_path:
+                # Best effort: a full disk must not break the page
+                try:
+                    with open(self.log_path, "a") as f:
+                        f.write(json.dumps(rec) + "\n")
+                except OSError:
+                    pass
+
+    # ─── Reading / export ────────────────────────────────────────────────────────
+    def records(self, run=None) -> list:
+        with self._lock:
+            return [dict(r) for r in self._records if run is None or r["run"] == run]
+
+    def to_json(self, run=None) -> str:
+        return json.dumps(self.records(run), indent=1)
+
+    def to_csv(self, run=None) -> str:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(self.records(run))
+        return buf.getvalue()
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+def summarize(records):
+    """Per (page, stage) totals: calls, wall time, median / p95 ms, bytes, hits and misses."""
+    import pandas as pd
+
+    if not records:
+        return pd.DataFrame(columns=["page", "stage", "calls", "total_ms", "median_ms", "p95_ms",
+                                     "bytes", "hits", "misses"])
+    df = pd.DataFrame(records, columns=FIELDS).fillna({"page": "-"})
+    df["ms"] = df["seconds"] * 1e3
+    out = df.groupby(["page", "stage"], sort=False).agg(
+        calls=("ms", "size"), total_ms=("ms", "sum"), median_ms=("ms", "median"),
+        p95_ms=("ms", lambda s: s.quantile(0.95)), bytes=("bytes", "sum"), hits=("hits", "sum"),
+        misses=("misses", "sum"))
+    return out.round(1).reset_index()
+
+
+# ─── Debug panel ────────────────────────────────────────────────────────────────
+def debug_enabled() -> bool:
+    return os.environ.get("DASHBOARD_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+def debug_panel(container, run=None):
+    """Sidebar panel with this run's stages, the all-session summary and JSON / CSV downloads."""
+    import streamlit as st
+
+    profiler = get_profiler()
+    latest = profiler.records(run)
+    with container.expander("Stage timings", expanded=True):
+        st.caption(f"This run: {sum(r['seconds'] for r in latest) * 1e3:.0f} ms in {len(latest)} stages")
+        st.dataframe(summarize(latest).drop(columns="page"), hide_index=True)
+        st.caption("All sessions since the last clear")
+        st.dataframe(summarize(profiler.records()), hide_index=True)
+        st.download_button("Download JSON", profiler.to_json(), "stage_timings.json", "application/json")
+        st.download_button("Download CSV", profiler.to_csv(), "stage_timings.csv", "text/csv")
+        if st.button("Clear timings"):
+            profiler.clear()
+
+
+_profiler = None
+
+
+def get_profiler() -> Profiler:
+    """Process-wide profiler; DASHBOARD_PROFILE_LOG appends every record to a JSON-lines file."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(log_path=os.environ.get("DASHBOARD_PROFILE_LOG"))
+    return _profiler
+
+
+def stage(stage, label="", context=None, **counts):
+    return get_profiler().stage(stage, label, context, **counts)
+
+
+def record(stage, label="", seconds=0.0, context=None, **counts):
+    get_profiler().record(stage, label, seconds, context, **counts)
+
+
+def note(bytes=0, hits=0, misses=0):
+    get_profiler().note(bytes, hits, misses)
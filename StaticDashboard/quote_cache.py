@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from market_data import clean_ohlcv, get_provider
+from profiling import frame_bytes, note
+
+# Process-wide LRU cache for short histories (quotes, intraday strips) shared by
+# every session and rerun. Entries expire quickly while the market is open and
+# stay valid until the next open while it is shut.
+
+MARKET_TZ = "America/New_York"
+MARKET_OPEN = pd.Timedelta(hours=9, minutes=30)
+MARKET_CLOSE = pd.Timedelta(hours=16)
+
+# Seconds an entry stays fresh during regular hours, by bar interval
+OPEN_TTL = {"1d": 30, "1wk": 300, "1mo": 900}
+DEFAULT_OPEN_TTL = 60
+# Empty results (unknown symbol, or an upstream error) are retried soon, even at weekends
+EMPTY_TTL = 60
+
+
+def market_is_open(now=None) -> bool:
+    """Regular-hours check (weekdays 9:30-16:00 ET; exchange holidays are not modelled)."""
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else now.tz_convert(MARKET_TZ)
+    since_midnight = now - now.normalize()
+    return now.dayofweek < 5 and MARKET_OPEN <= since_midnight < MARKET_CLOSE
+
+
+def next_open(now=None) -> pd.Timestamp:
+    """Timestamp of the next regular-session open after ``now``."""
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else now.tz_convert(MARKET_TZ)
+    day = now.normalize()
+    if now - day >= MARKET_OPEN:
+        day += pd.Timedelta(days=1)
+    while day.dayofweek >= 5:
+        day += pd.Timedelta(days=1)
+    return day + MARKET_OPEN
+
+
+def ttl_for(interval, now=None) -> float:
+    """Seconds an entry fetched ``now`` stays valid."""
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else now
+    if market_is_open(now):
+        return OPEN_TTL.get(interval, DEFAULT_OPEN_TTL)
+    return max((next_open(now) - now).total_seconds(), DEFAULT_OPEN_TTL)
+
+
+class QuoteCache:
+    def __init__(self, maxsize=4096, provider=None):
+        self.maxsize = maxsize
+        self.provider = provider
+        self._data = OrderedDict()  # key -> (expires_at, DataFrame)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def _lookup(self, key, now):
+        item = self._data.get(key)
+        if item is None or item[0] <= now:
+            return None
+        self._data.move_to_end(key)
+        return item[1]
+
+    def _store(self, key, value, expires_at):
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def history(self, symbols, period, interval="1d") -> dict:
+        """``{symbol: DataFrame}`` like ``MarketDataProvider.history``; only misses go upstream.
+
+        Every caller gets its own copy, so a session can't modify the cached frames.
+        """
+        now = time.time()
+        out, missing = {}, []
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                hit = self._lookup((symbol, period, interval), now)
+                if hit is None:
+                    missing.append(symbol)
+                    self.misses += 1
+                else:
+                    out[symbol] = hit.copy()
+                    self.hits += 1
+        note(hits=len(out), misses=len(missing))
+        if missing:
+            try:
+                fetched = (self.provider or get_provider()).history(missing, period=period, interval=interval)
+            except Exception:
+                fetched = {}
+            fetched = {s: fetched.get(s, clean_ohlcv(None)) for s in missing}
+            ttl = ttl_for(interval)
+            with self._lock:
+                for symbol, df in fetched.items():
+                    self._store((symbol, period, interval), df, now + (ttl if len(df) else min(ttl, EMPTY_TTL)))
+            note(bytes=frame_bytes(fetched))
+            out.update({s: df.copy() for s, df in fetched.items()})
+        return out
+
+    def fetch_many(self, requests) -> dict:
+        """Cached counterpart of ``MarketDataProvider.fetch_many``."""
+        groups = {}
+        for symbol, period, interval in requests:
+            groups.setdefault((period, interval), []).append(symbol)
+        out = {}
+        for (period, interval), symbols in groups.items():
+            for symbol, df in self.history(symbols, period, interval).items():
+                out[(symbol, period, interval)] = df
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "hit_rate": self.hits / total if total else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_cache = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Process-wide quote cache shared by every session."""
+    global _cache
+    if _cache is None:
+        _cache = QuoteCache()
+    return _cache
@@ -0,0 +1,175 @@
+import datetime
+import threading
+import time
+
+from market_data import get_provider
+from quote_cache import market_is_open
+from profiling import note
+
+# One background refresher per server process. Sessions subscribe to the symbols
+# they show; the refresher keeps a snapshot row per symbol for the union of all
+# subscriptions and refreshes it in bulk on a schedule. Pages read the latest
+# snapshot instead of fetching during their script run.
+
+OPEN_INTERVAL = 15       # seconds between refreshes during regular hours
+CLOSED_INTERVAL = 300    # ... and while the market is shut
+SESSION_TIMEOUT = 600    # drop a session's subscription after this long without a read
+BATCH_SIZE = 200         # symbols per bulk request
+
+
+def quote_row(symbol, hist) -> dict:
+    """Watchlist table row from a 2-day daily history."""
+    row = {'Ticker': symbol, 'Date': None, 'Open': None, 'Close': None, '% Change': None, 'Volume': None,
+           'Prev Close': None}
+    if hist is not None and len(hist) >= 1:
+        latest = hist.iloc[-1]
+        row.update({'Date': latest.name.date().isoformat(), 'Open': latest['Open'],
+                    'Close': latest['Close'], 'Volume': latest['Volume']})
+        if len(hist) >= 2:
+            prev_close = hist['Close'].iloc[-2]
+            row['Prev Close'] = prev_close
+            if prev_close:
+                row['% Change'] = round((latest['Close'] - prev_close) / prev_close * 100, 2)
+    return row
+
+
+class QuoteRefresher:
+    def __init__(self, provider=None):
+        self.provider = provider
+        self._sessions = {}   # subscription key -> (symbols, last seen)
+        self._snapshot = {}   # symbol -> row
+        self._failed = set()  # watched symbols whose last fetch failed (readers don't wait for them)
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_refresh = None
+        self.refreshes = 0
+
+    # ─── Subscriptions ─────────────────────────────────────────────────────────
+    def subscribe(self, key, symbols):
+        """Register (or replace) the symbols watched under ``key`` (one per session and page)."""
+        symbols = list(dict.fromkeys(symbols))
+        with self._cond:
+            previous = self._sessions.get(key, ((), 0))[0]
+            self._sessions[key] = (symbols, time.time())
+            new = [s for s in symbols if s not in self._snapshot and s not in self._failed and s not in previous]
+        self._ensure_running()
+        if new:
+            self._wake.set()
+
+    def add_listener(self, callback):
+        """Call ``callback(snapshot)`` after every refresh (from the refresher thread)."""
+        self._listeners.append(callback)
+
+    def watched(self):
+        cutoff = time.time() - SESSION_TIMEOUT
+        with self._cond:
+            for sid in [sid for sid, (_, seen) in self._sessions.items() if seen < cutoff]:
+                del self._sessions[sid]
+            return list(dict.fromkeys(s for symbols, _ in self._sessions.values() for s in symbols))
+
+    # ─── Reads ─────────────────────────────────────────────────────────────────
+    def snapshot(self, symbols, wait=0.0) -> dict:
+        """Latest rows for ``symbols``.
+
+        Never fetches. ``wait`` bounds how long to block for symbols that have not been
+        loaded yet (first visit); known symbols, and symbols whose last fetch failed,
+        return immediately.
+        """
+        deadline = time.time() + wait
+        with self._cond:
+            while wait and any(s not in self._snapshot and s not in self._failed for s in symbols):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return {s: self._snapshot[s] for s in symbols if s in self._snapshot}
+
+    # ─── Refresh loop ──────────────────────────────────────────────────────────
+    def refresh(self):
+        symbols = self.watched()
+        provider = self.provider or get_provider()
+        rows, failed = {}, set()
+        for i in range(0, len(symbols), BATCH_SIZE):
+            batch = symbols[i:i + BATCH_SIZE]
+            try:
+                histories = provider.history(batch, period='2d')
+            except Exception:
+                failed.update(batch)  # keep the previous rows for this batch
+                continue
+            for s in batch:
+                row = quote_row(s, histories.get(s))
+                if row['Date'] is None:
+                    failed.add(s)  # no data (e.g. an empty download) keeps the previous row too
+                else:
+                    rows[s] = row
+        with self._cond:
+            # Symbols nobody watches any more are dropped, so watching one again waits
+            # for a fresh row instead of reading one that may be hours old
+            watched = set(symbols)
+            for s in [s for s in self._snapshot if s not in watched]:
+                del self._snapshot[s]
+            self._snapshot.update(rows)
+            self._failed = {s for s in failed if s not in self._snapshot}
+            self.last_refresh = datetime.datetime.now()
+            self.refreshes += 1
+            snapshot = dict(self._snapshot)
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception:
+                pass
+        # Wake first-visit readers only once listeners (e.g. the watchlist store) have the rows
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            self.refresh()
+            self._wake.wait(OPEN_INTERVAL if market_is_open() else CLOSED_INTERVAL)
+
+    def stop(self, timeout=10.0):
+        """End the refresh thread (after its current refresh) and wait for it."""
+        self._stop.set()
+        self._wake.set()
+        with self._cond:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_running(self):
+        with self._cond:
+            if not self._stop.is_set() and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="quote-refresher", daemon=True)
+                self._thread.start()
+
+
+_refresher = None
+_lock = threading.Lock()
+
+
+def get_refresher() -> QuoteRefresher:
+    """The process-wide refresher (its thread starts on the first subscription)."""
+    global _refresher
+    with _lock:
+        if _refresher is None:
+            _refresher = QuoteRefresher()
+        return _refresher
+
+
+def watch(key, symbols, wait=5.0) -> dict:
+    """Subscribe ``key`` (e.g. ``(session_id, page)``) to ``symbols`` and return their latest rows.
+
+    Each page subscribes under its own key, so pages of one session don't replace
+    each other's symbols. Only the first look at a symbol waits (up to ``wait``
+    seconds) for the refresher to load it; after that this returns the current
+    snapshot at once. Symbols whose fetch failed are left out without waiting.
+    """
+    refresher = get_refresher()
+    refresher.subscribe(key, symbols)
+    rows = refresher.snapshot(symbols, wait=wait)
+    note(hits=len(rows), misses=len(set(symbols)) - len(rows))
+    return rows
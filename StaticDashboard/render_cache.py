@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Rendered-chart cache shared by every session. Keys are content hashes of what
+# a chart depends on (ticker, interval, bar data fingerprint, overlay options),
+# values are PNG bytes. A byte-bounded in-memory LRU sits in front of an
+# optional on-disk tier (DASHBOARD_RENDER_CACHE_DIR).
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def chart_key(tkr, intr, df, opts, sma_list, ema_list, hma_list) -> str:
+    """Fingerprint of every input that changes a chart's pixels.
+
+    The bar data (``ohlcv.Bars`` or a DataFrame) is summarized by its length,
+    first/last timestamps and the last bar's values (the only bar that changes
+    between fetches of the same range).
+    """
+    if hasattr(df, "ts"):
+        ts = df.ts
+        last = df.values[:, -1].astype(np.float64) if len(df) else np.empty(0)
+    else:
+        ts = df.index.as_unit("ns").asi8
+        last = df.iloc[-1].to_numpy(dtype=np.float64) if len(df) else np.empty(0)
+    payload = {
+        "ticker": tkr, "interval": intr, "bars": len(df),
+        "first": int(ts[0]) if len(df) else None,
+        "last": int(ts[-1]) if len(df) else None,
+        "last_bar": last.tobytes().hex(),
+        "sma": list(sma_list), "ema": list(ema_list), "hma": list(hma_list),
+        "opts": {k: opts[k] for k in sorted(opts)},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class RenderCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None, disk_max_bytes=DEFAULT_DISK_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._mem = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+        self._disk_bytes = 0  # running size of the disk tier, resynced whenever it is trimmed
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._trim_disk()
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.png")
+
+    def _remember(self, key, data):
+        if key in self._mem:
+            self._mem_bytes -= len(self._mem.pop(key))
+        self._mem[key] = data
+        self._mem_bytes += len(data)
+        while self._mem_bytes > self.max_bytes and len(self._mem) > 1:
+            _, old = self._mem.popitem(last=False)
+            self._mem_bytes -= len(old)
+
+    def get(self, key):
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return data
+        if self.disk_dir:
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+                os.utime(self._path(key))  # mtime doubles as the disk tier's LRU clock
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._remember(key, data)
+                    self.disk_hits += 1
+                return data
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data: bytes):
+        with self._lock:
+            self._remember(key, data)
+        if self.disk_dir:
+            # The disk tier is best effort; a failed write only costs a future re-render
+            try:
+                try:
+                    replaced = os.stat(self._path(key)).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                tmp = self._path(key) + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self._path(key))
+                with self._lock:
+                    self._disk_bytes += len(data) - replaced
+                    over = self._disk_bytes > self.disk_max_bytes
+                if over:
+                    self._trim_disk()
+            except OSError:
+                pass
+
+    def _trim_disk(self):
+        """Evict the least recently used files until the disk tier fits (one directory scan)."""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".png"):
+                st = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = total
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "entries": len(self._mem), "bytes": self._mem_bytes}
+
+
+_cache = None
+
+
+def get_render_cache() -> RenderCache:
+    """Process-wide render cache; set DASHBOARD_RENDER_CACHE_DIR to add the disk tier."""
+    global _cache
+    if _cache is None:
+        _cache = RenderCache(disk_dir=os.environ.get("DASHBOARD_RENDER_CACHE_DIR"))
+    return _cache
@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from market_data import period_offset, period_start
+from ohlcv import CLOSE, HIGH, LOW, OPEN, VOLUME, Bars
+
+# Multi-timeframe engine: keep the finest useful bars per symbol in the bar store
+# and build every coarser timeframe locally, so switching the Charting timeframe
+# does not go back to the network.
+
+# Finest base first. Each base is fetched once for its ``period`` (roughly the
+# upstream history limit at that resolution) and serves every coarser target.
+INTRADAY_BASES = [("5m", "1mo"), ("1h", "1y")]
+DAILY_BASE = ("1d", "5y")
+INTRADAY_MINUTES = {"5m": 5, "15m": 15, "30m": 30, "1h": 60, "4h": 240}
+DAILY_TARGETS = ("1d", "1wk", "1mo")
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30).value
+MARKET_TZ = "America/New_York"
+
+
+def base_for(period, interval):
+    """(base interval, base period) used to serve ``period`` of ``interval`` bars.
+
+    Falls back to fetching the target directly when no base covers the request.
+    """
+    want = period_start(period)
+    if interval in DAILY_TARGETS:
+        candidates = [DAILY_BASE]
+    elif interval in INTRADAY_MINUTES:
+        candidates = [(b, p) for b, p in INTRADAY_BASES
+                      if INTRADAY_MINUTES[interval] % INTRADAY_MINUTES[b] == 0]
+    else:
+        candidates = []
+    for base, base_period in candidates:
+        if period_start(base_period) <= want:
+            return base, base_period
+    return interval, period
+
+
+def aggregate(bars, starts):
+    """OHLCV block merging each run of bars from ``starts[i]`` up to the next start.
+
+    First open, max high, min low, last close and summed volume, as a float32
+    (5, len(starts)) block. Also used by ``decimate`` to thin bars for plotting.
+    """
+    ends = np.r_[starts[1:], len(bars)] - 1
+    block = np.empty((5, len(starts)), dtype=np.float32)
+    block[OPEN] = bars.open[starts]
+    block[HIGH] = np.maximum.reduceat(bars.high, starts)
+    block[LOW] = np.minimum.reduceat(bars.low, starts)
+    block[CLOSE] = bars.close[ends]
+    block[VOLUME] = np.add.reduceat(np.nan_to_num(bars.volume), starts, dtype=np.float64)
+    return block
+
+
+def _aggregate(bars, keys):
+    """OHLCV aggregation of consecutive bars sharing a bucket key (bars must be sorted).
+
+    Returns the bucket start offsets and the aggregated float32 (5, buckets) block.
+    """
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return starts, aggregate(bars, starts)
+
+
+def resample_bars(bars: Bars, interval: str) -> Bars:
+    """Aggregate ``bars`` into ``interval`` bars.
+
+    Intraday buckets are anchored at the 9:30 ET session open and never span two
+    sessions, so 4h bars are 9:30-13:30 and 13:30-16:00 like the exchange feed.
+    Daily, weekly and monthly bars are labelled by session date, week Monday and
+    month start, matching yfinance.
+    """
+    if bars.empty:
+        return bars
+    wall = bars.index().tz_convert(MARKET_TZ).tz_localize(None)
+    wall_ns = wall.as_unit("ns").asi8
+    day_ns = wall.normalize().as_unit("ns").asi8
+    if interval in INTRADAY_MINUTES:
+        step = INTRADAY_MINUTES[interval] * pd.Timedelta(minutes=1).value
+        buckets = day_ns + SESSION_OPEN + np.floor_divide(wall_ns - day_ns - SESSION_OPEN, step) * step
+    elif interval == "1d":
+        buckets = day_ns
+    elif interval == "1wk":
+        buckets = day_ns - wall.dayofweek.to_numpy().astype(np.int64) * pd.Timedelta(days=1).value
+    elif interval == "1mo":
+        buckets = wall.to_period("M").start_time.as_unit("ns").asi8
+    else:
+        raise ValueError(f"Unsupported interval: {interval}")
+    starts, block = _aggregate(bars, buckets)
+    # Bucket labels are wall-clock times in the market timezone
+    labels = pd.DatetimeIndex(buckets[starts]).tz_localize(MARKET_TZ, ambiguous="NaT", nonexistent="shift_forward")
+    return Bars(labels.as_unit("ns").asi8, block, bars.tz).freeze()
+
+
+class ResampleEngine:
+    """Serves any (period, interval) as ``ohlcv.Bars`` from base bars, caching each resampled result."""
+
+    def __init__(self, store=None, max_entries=1024, max_recent=512):
+        self.store = store
+        self.max_entries = max_entries
+        self.max_recent = max_recent
+        self._cache = OrderedDict()
+        self._recent = OrderedDict()  # (symbols, period, interval) -> (expires_at, result)
+        self._lock = threading.Lock()
+
+    def get(self, symbols, period, interval) -> dict:
+        from bar_store import get_bar_store
+
+        store = self.store or get_bar_store()
+        base, base_period = base_for(period, interval)
+        bars = store.get_bars(symbols, base_period, base)
+        out = {}
+        for symbol, b in bars.items():
+            lo = period_offset(b.ts, period)
+            b = b if lo == 0 else b.take(slice(lo, None))
+            if base != interval and not b.empty:
+                # Keyed by the base data's extent so a new or revised bar invalidates it
+                key = (symbol, base, interval, len(b), int(b.ts[0]), int(b.ts[-1]), float(b.close[-1]))
+                with self._lock:
+                    cached = self._cache.get(key)
+                if cached is None:
+                    cached = resample_bars(b, interval)
+                    with self._lock:
+                        self._cache[key] = cached
+                        while len(self._cache) > self.max_entries:
+                            self._cache.popitem(last=False)
+                b = cached
+            out[symbol] = b
+        return out
+
+
+    def get_recent(self, symbols, period, interval) -> dict:
+        """``get`` memoized per (symbols, period, interval) for the interval's refresh time.
+
+        Safe from any thread (the Charting page calls it from its fetch thread), so a
+        widget rerun within that time skips the bar store entirely.
+        """
+        from bar_store import refresh_after
+
+        key, now = (tuple(symbols), period, interval), time.time()
+        with self._lock:
+            item = self._recent.get(key)
+            if item is not None and item[0] > now:
+                self._recent.move_to_end(key)
+                return item[1]
+        out = self.get(symbols, period, interval)
+        with self._lock:
+            self._recent[key] = (now + refresh_after(interval), out)
+            while len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+        return out
+
+
+_engine = None
+
+
+def get_resample_engine() -> ResampleEngine:
+    """Process-wide engine; its resampled frames are shared by every session."""
+    global _engine
+    if _engine is None:
+        _engine = ResampleEngine()
+    return _engine
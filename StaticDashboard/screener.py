@@ -0,0 +1,193 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Cross-sectional screener behind the Screener page. A universe's closes are
+# aligned into one (time, symbol) float32 matrix and every indicator is computed
+# for all symbols at once along the time axis, so screening thousands of symbols
+# is a handful of array passes instead of a loop over tickers. The indicators
+# follow the Charting page: rolling SMA, EMA with adjust=False, Bollinger bands
+# on the sample std, and a 30-bar rolling min/max of closes as support/resistance.
+
+SR_WINDOW = 30
+FETCH_CHUNK = 200  # symbols per bar-store request when loading a universe
+# Crossover direction (-1, 0, +1) + 1 -> label
+CROSS_LABELS = np.array(["Bearish", "", "Bullish"], dtype=object)
+
+
+# ─── Universe ───────────────────────────────────────────────────────────────────
+def parse_symbols(text) -> list:
+    """Upper-cased symbols from comma, space or newline separated text (``#`` starts a comment)."""
+    text = "\n".join(line.split("#")[0] for line in text.splitlines())
+    return list(dict.fromkeys(s.upper() for s in re.split(r"[\s,;]+", text) if s))
+
+
+def load_universe(path=None) -> list:
+    """Symbols listed in ``path`` (default ``DASHBOARD_UNIVERSE``); empty when unset."""
+    path = path or os.environ.get("DASHBOARD_UNIVERSE")
+    if not path or not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return parse_symbols(f.read())
+
+
+def fetch_universe(symbols, period, interval="1d", store=None, chunk_size=FETCH_CHUNK) -> dict:
+    """``{symbol: ohlcv.Bars}`` for a large universe, fetched in chunks.
+
+    Each chunk is its own bulk request, so the provider (whose downloads run one at a
+    time) is free for Charting, Home and the quote refresher between chunks instead
+    of being held for one request of thousands of symbols.
+    """
+    from bar_store import get_bar_store
+
+    store = store or get_bar_store()
+    symbols = list(dict.fromkeys(symbols))
+    out = {}
+    for i in range(0, len(symbols), chunk_size):
+        out.update(store.get_bars(symbols[i:i + chunk_size], period, interval))
+    return out
+
+
+# ─── Price matrix ───────────────────────────────────────────────────────────────
+def price_matrix(bars: dict):
+    """``(ts, symbols, close)`` for ``{symbol: ohlcv.Bars}`` aligned on the union of their timestamps.
+
+    ``close`` is a (len(ts), len(symbols)) float32 matrix. A missing bar carries the
+    symbol's previous close forward; rows before its first bar stay NaN. Symbols
+    without bars are dropped.
+    """
+    symbols = [s for s, b in bars.items() if b is not None and not b.empty]
+    if not symbols:
+        return np.empty(0, dtype=np.int64), [], np.empty((0, 0), dtype=np.float32)
+    all_ts = np.concatenate([bars[s].ts for s in symbols])
+    cols = np.repeat(np.arange(len(symbols)), [len(bars[s]) for s in symbols])
+    ts = np.unique(all_ts)
+    close = np.full((len(ts), len(symbols)), np.nan, dtype=np.float32)
+    close[np.searchsorted(ts, all_ts), cols] = np.concatenate([bars[s].close for s in symbols])
+    return ts, symbols, _ffill(close)
+
+
+def _ffill(x):
+    rows = np.where(np.isnan(x), 0, np.arange(len(x))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return x[rows, np.arange(x.shape[1])]
+
+
+# ─── Indicators (every column at once) ──────────────────────────────────────────
+def _tail(close, rows):
+    """Last ``rows`` rows as float64, NaN-padded at the top when the history is shorter."""
+    out = np.full((rows, close.shape[1]), np.nan)
+    n = min(rows, len(close))
+    if n:
+        out[rows - n:] = close[len(close) - n:]
+    return out
+
+
+def pct_change(close, bars=1) -> np.ndarray:
+    """% change of the last close against the close ``bars`` bars earlier."""
+    window = _tail(close, bars + 1)
+    return (window[-1] / window[0] - 1) * 100
+
+
+def sma_tail(close, period, rows) -> np.ndarray:
+    """(rows, symbols) simple MA over the last ``rows`` bars; NaN until the window is full."""
+    x = _tail(close, rows + period - 1)
+    return sliding_window_view(x, period, axis=0).mean(axis=-1)
+
+
+def ema_tail(close, periods, rows) -> np.ndarray:
+    """(len(periods), rows, symbols) EMAs (``adjust=False``), each seeded at the symbol's first close.
+
+    The recursion runs once over time for every period and symbol together.
+    """
+    alpha = (2.0 / (np.asarray(periods, dtype=np.float64) + 1))[:, None]
+    ema = np.full((len(periods), close.shape[1]), np.nan)
+    out = np.full((len(periods), rows, close.shape[1]), np.nan)
+    first = len(close) - rows
+    step = np.empty_like(ema)
+    seeding = True
+    for t, x in enumerate(close):
+        if seeding:
+            # Until every symbol has its first close, unseeded columns take the close as is
+            ema = np.where(np.isnan(ema), x, ema + alpha * (x - ema))
+            seeding = bool(np.isnan(ema).any())
+        else:
+            np.subtract(x, ema, out=step)
+            step *= alpha
+            ema += step
+        if t >= first:
+            out[:, t - first] = ema
+    return out
+
+
+def crossover(fast, slow):
+    """``(direction, bars_ago)`` of the latest fast/slow cross within the given (rows, symbols) lines.
+
+    ``direction`` is +1 where fast crossed above slow, -1 below and 0 without a cross;
+    ``bars_ago`` is 0 when it happened on the last bar and NaN without a cross. Each
+    bar is compared with the last side the lines were on, so touching (equal lines,
+    common in flat forward-filled series) and returning is not a cross.
+    """
+    side = np.sign(fast - slow)
+    side[side == 0] = np.nan
+    side = _ffill(side)
+    crossed = (side[1:] != side[:-1]) & ~np.isnan(side[:-1]) & ~np.isnan(side[1:])
+    any_cross = crossed.any(axis=0)
+    last = len(crossed) - 1 - np.argmax(crossed[::-1], axis=0)
+    direction = np.where(any_cross, side[-1], 0).astype(np.int8)
+    bars_ago = np.where(any_cross, len(crossed) - 1 - last, np.nan)
+    return direction, bars_ago
+
+
+def bollinger_position(close, window=20, num_std=2.0) -> np.ndarray:
+    """%B of the last close: 0 at the lower band, 1 at the upper band."""
+    x = _tail(close, window)
+    mid, std = x.mean(axis=0), x.std(axis=0, ddof=1)
+    lower = mid - num_std * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (x[-1] - lower) / (2 * num_std * std)
+
+
+def support_resistance(close, window=SR_WINDOW):
+    """``(support %, resistance %)``: distance of the last close to the ``window``-bar low and high."""
+    x = _tail(close, window)
+    last = x[-1]
+    return (last - x.min(axis=0)) / last * 100, (x.max(axis=0) - last) / last * 100
+
+
+# ─── Screen ─────────────────────────────────────────────────────────────────────
+def screen(close, symbols, sma=(20, 50), ema=(10, 30), bb_window=20, bb_std=2.0, change_bars=20,
+           cross_lookback=5) -> pd.DataFrame:
+    """One row per symbol with the latest value of every screener column.
+
+    ``sma`` / ``ema`` are (fast, slow) period pairs; a cross counts when it happened
+    within the last ``cross_lookback`` bars. Column names don't depend on the
+    parameters (see ``column_labels`` for display names).
+    """
+    rows = cross_lookback + 1
+    sma_dir, sma_ago = crossover(sma_tail(close, sma[0], rows), sma_tail(close, sma[1], rows))
+    fast, slow = ema_tail(close, ema, rows)
+    ema_dir, ema_ago = crossover(fast, slow)
+    support, resistance = support_resistance(close)
+    return pd.DataFrame({
+        "Ticker": symbols,
+        "Close": _tail(close, 1)[0],
+        "% Change": pct_change(close, 1),
+        "% Change (N bars)": pct_change(close, change_bars),
+        "SMA cross": CROSS_LABELS[sma_dir + 1],
+        "SMA cross age": sma_ago,
+        "EMA cross": CROSS_LABELS[ema_dir + 1],
+        "EMA cross age": ema_ago,
+        "Bollinger %B": bollinger_position(close, bb_window, bb_std),
+        "Support %": support,
+        "Resistance %": resistance,
+    })
+
+
+def column_labels(sma=(20, 50), ema=(10, 30), change_bars=20) -> dict:
+    """Display names for the ``screen`` columns that depend on the parameters."""
+    return {"% Change (N bars)": f"% Change ({change_bars} bars)", "SMA cross": f"SMA {sma[0]}/{sma[1]}",
+            "EMA cross": f"EMA {ema[0]}/{ema[1]}"}
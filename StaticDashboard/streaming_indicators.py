@@ -0,0 +1,331 @@
+import copy
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicators import compute_indicators
+
+# Stateful indicators that are seeded from history and then advanced one bar at
+# a time in O(1). They reproduce the batch results in indicators.py to within
+# floating-point rounding; running sums are re-summed exactly once per window
+# length so drift never accumulates.
+
+
+class RingBuffer:
+    """Fixed-size window of the most recent values."""
+
+    def __init__(self, size):
+        self.size = size
+        self.buf = np.zeros(size)
+        self.count = 0
+        self.head = 0  # next write position
+
+    def push(self, x):
+        """Append ``x``; return the value that fell out of the window (or None)."""
+        old = self.buf[self.head] if self.count == self.size else None
+        self.buf[self.head] = x
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        return old
+
+    @property
+    def full(self):
+        return self.count == self.size
+
+    def values(self):
+        """Window contents, oldest first."""
+        if not self.full:
+            return self.buf[:self.count].copy()
+        return np.concatenate([self.buf[self.head:], self.buf[:self.head]])
+
+
+class StreamingSMA:
+    def __init__(self, period):
+        self.period = period
+        self.window = RingBuffer(period)
+        self.total = 0.0
+        self._since_resync = 0
+
+    def update(self, x):
+        old = self.window.push(x)
+        self.total += x - (old if old is not None else 0.0)
+        self._since_resync += 1
+        if self._since_resync >= self.period:
+            self.total = float(np.sum(self.window.values()))
+            self._since_resync = 0
+        return self.total / self.period if self.window.full else np.nan
+
+
+class StreamingEMA:
+    """EMA with ``adjust=False``: e = (1 - a) * e + a * x, seeded with the first value."""
+
+    def __init__(self, period):
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+
+    def update(self, x):
+        self.value = x if self.value is None else (1 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+class StreamingWMA:
+    """Linearly weighted MA using a running sum and a running weighted sum.
+
+    Dropping the oldest bar lowers every remaining weight by one, so
+    ``weighted' = weighted - total + period * x``.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.denom = period * (period + 1) / 2
+        self.window = RingBuffer(period)
+        self.total = 0.0
+        self.weighted = 0.0
+        self._since_resync = 0
+
+    def update(self, x):
+        if np.isnan(x):
+            # Mirrors the batch version: a NaN restarts the window
+            self.__init__(self.period)
+            return np.nan
+        if self.window.full:
+            self.weighted += self.period * x - self.total
+            self.total += x - self.window.push(x)
+        else:
+            self.window.push(x)
+            self.total += x
+            self.weighted += self.window.count * x
+        self._since_resync += 1
+        if self._since_resync >= self.period and self.window.full:
+            vals = self.window.values()
+            self.total = float(np.sum(vals))
+            self.weighted = float(np.dot(vals, np.arange(1, self.period + 1)))
+            self._since_resync = 0
+        return self.weighted / self.denom if self.window.full else np.nan
+
+
+class StreamingHMA:
+    def __init__(self, period):
+        self.half = StreamingWMA(int(period / 2))
+        self.full = StreamingWMA(period)
+        self.smooth = StreamingWMA(int(np.sqrt(period)))
+
+    def update(self, x):
+        return self.smooth.update(2 * self.half.update(x) - self.full.update(x))
+
+
+class StreamingBollinger:
+    """Rolling mean and sample std via a sliding Welford update."""
+
+    def __init__(self, window=20, num_std=2.0):
+        self.n = window
+        self.k = num_std
+        self.window = RingBuffer(window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since_resync = 0
+
+    def update(self, x):
+        old = self.window.push(x)
+        if old is None:
+            delta = x - self.mean
+            self.mean += delta / self.window.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            prev_mean = self.mean
+            self.mean += (x - old) / self.n
+            self.m2 += (x - old) * (x - self.mean + old - prev_mean)
+        self._since_resync += 1
+        if self._since_resync >= self.n and self.window.full:
+            vals = self.window.values()
+            self.mean = float(vals.mean())
+            self.m2 = float(((vals - self.mean) ** 2).sum())
+            self._since_resync = 0
+        if not self.window.full:
+            return np.nan, np.nan, np.nan
+        std = np.sqrt(max(self.m2, 0.0) / (self.n - 1))
+        return self.mean + self.k * std, self.mean, self.mean - self.k * std
+
+
+class StreamingMinMax:
+    """Rolling min and max over ``window`` bars with monotonic deques (amortized O(1))."""
+
+    def __init__(self, window=30):
+        self.window = window
+        self.i = 0
+        self.lows = deque()   # (index, value), increasing values
+        self.highs = deque()  # (index, value), decreasing values
+
+    def update(self, x):
+        while self.lows and self.lows[-1][1] >= x:
+            self.lows.pop()
+        while self.highs and self.highs[-1][1] <= x:
+            self.highs.pop()
+        self.lows.append((self.i, x))
+        self.highs.append((self.i, x))
+        expired = self.i - self.window
+        while self.lows[0][0] <= expired:
+            self.lows.popleft()
+        while self.highs[0][0] <= expired:
+            self.highs.popleft()
+        self.i += 1
+        if self.i < self.window:
+            return np.nan, np.nan
+        return self.lows[0][1], self.highs[0][1]
+
+
+# ─── Indicator set for one chart ────────────────────────────────────────────────
+class IndicatorSet:
+    """Every overlay ``plot_chart`` draws, advanced together one close at a time.
+
+    ``update`` returns one flat row of values: SMAs, EMAs, HMAs, then Bollinger
+    (upper, mid, lower) and rolling (min, max) for support/resistance when enabled.
+    """
+
+    def __init__(self, sma=(), ema=(), hma=(), bb_window=None, bb_std=2.0, sr_window=30):
+        self.sma = [StreamingSMA(p) for p in sma]
+        self.ema = [StreamingEMA(p) for p in ema]
+        self.hma = [StreamingHMA(p) for p in hma]
+        self.bb = StreamingBollinger(bb_window, bb_std) if bb_window else None
+        self.sr = StreamingMinMax(sr_window) if sr_window else None
+        self.params = (list(sma), list(ema), list(hma), bb_window, bb_std, sr_window)
+        self.width = len(self.sma) + len(self.ema) + len(self.hma) + (3 if self.bb else 0) + (2 if self.sr else 0)
+
+    def update(self, x):
+        row = [s.update(x) for s in self.sma] + [e.update(x) for e in self.ema] + [h.update(x) for h in self.hma]
+        if self.bb:
+            row.extend(self.bb.update(x))
+        if self.sr:
+            row.extend(self.sr.update(x))
+        return row
+
+    def warm_up(self, closes) -> np.ndarray:
+        """Seed from history with the vectorized batch engine instead of a Python loop.
+
+        Returns the (n, width) table of rows for ``closes``. Only the last few
+        windows are replayed through ``update`` to fill the ring buffers; EMAs are
+        started from the batch value just before that tail.
+        """
+        sma, ema, hma, bb_window, bb_std, sr_window = self.params
+        closes = np.asarray(closes, dtype=np.float64)
+        n = len(closes)
+        batch = compute_indicators(closes, sma, ema, hma, bb_window, bb_std)
+        parts = [batch["sma"], batch["ema"], batch["hma"]]
+        if self.bb:
+            parts.append(batch["bollinger"])
+        if self.sr:
+            sr = np.full((2, n), np.nan)
+            if n >= sr_window:
+                windows = sliding_window_view(closes, sr_window)
+                sr[0, sr_window - 1:], sr[1, sr_window - 1:] = windows.min(axis=1), windows.max(axis=1)
+            parts.append(sr)
+        table = np.vstack(parts).T if parts else np.empty((n, 0))
+        # Longest memory among the finite-window indicators
+        spans = [p for p in sma] + [p + int(np.sqrt(p)) for p in hma] + [bb_window or 0, sr_window or 0]
+        tail = max(0, n - max(spans + [1]))
+        for i, e in enumerate(self.ema):
+            e.value = batch["ema"][i, tail - 1] if tail else None
+        if self.sr:
+            self.sr.i = tail
+        for x in closes[tail:]:
+            self.update(x)
+        return table
+
+    def split(self, table: np.ndarray) -> dict:
+        """Cut a (n, width) table of rows into the ``compute_indicators`` layout.
+
+        Adds ``"support_resistance"`` as a (2, n) array of rolling min/max.
+        """
+        cols, out = 0, {}
+        for key, count in (("sma", len(self.sma)), ("ema", len(self.ema)), ("hma", len(self.hma)),
+                           ("bollinger", 3 if self.bb else 0), ("support_resistance", 2 if self.sr else 0)):
+            out[key] = table[:, cols:cols + count].T
+            cols += count
+        if not self.bb:
+            out["bollinger"] = None
+        if not self.sr:
+            out["support_resistance"] = None
+        return out
+
+
+class IncrementalIndicators:
+    """Keeps an ``IndicatorSet`` in step with a growing bar history.
+
+    Bars up to the second-to-last are committed to the state and their output rows
+    kept in a growable table. The last bar may still be forming, so it is applied
+    to a copy of the (small) indicator state on each call. If the history no longer
+    extends the committed bars (a refetch with a different start), the state is
+    reseeded.
+    """
+
+    def __init__(self, **params):
+        self.params = params
+        self._reset()
+        self.lock = threading.Lock()
+
+    def _reset(self):
+        self.state = IndicatorSet(**self.params)
+        # float32 rows; the committed bars plus one spare row for the forming bar
+        self.table = np.empty((256, self.state.width), dtype=np.float32)
+        self.count = 0
+        self.last_ts = None
+
+    def _reserve(self, rows):
+        if rows > len(self.table):
+            grown = np.empty((max(rows, 2 * len(self.table)), self.state.width), dtype=np.float32)
+            grown[:self.count] = self.table[:self.count]
+            self.table = grown
+
+    def _append(self, row):
+        self._reserve(self.count + 1)
+        self.table[self.count] = row
+        self.count += 1
+
+    def sync(self, timestamps, closes) -> dict:
+        timestamps = np.asarray(timestamps)
+        closes = np.asarray(closes, dtype=np.float64)
+        if self.count and (self.count > len(timestamps) - 1 or timestamps[self.count - 1] != self.last_ts):
+            self._reset()
+        if not self.count and len(closes) > 1:
+            warm = self.state.warm_up(closes[:-1])
+            self._reserve(len(warm) + 1)
+            self.table[:len(warm)] = warm
+            self.count = len(warm)
+        for x in closes[self.count:-1]:
+            self._append(self.state.update(x))
+        if len(closes) > 1:
+            self.last_ts = timestamps[len(closes) - 2]
+        rows = self.count
+        if len(closes):
+            # The forming bar goes in the spare row without being committed
+            self._reserve(self.count + 1)
+            self.table[self.count] = copy.deepcopy(self.state).update(closes[-1])
+            rows += 1
+        # One copy taken under the lock: the state is shared by every session, and the
+        # next sync (from any of them) rewrites the forming row while this result may
+        # still be rendering or being pickled to a render worker
+        return self.state.split(self.table[:rows].copy())
+
+
+_states = OrderedDict()
+_states_lock = threading.Lock()
+MAX_STATES = 512
+
+
+def incremental_indicators(key, timestamps, closes, **params) -> dict:
+    """Indicator rows for ``closes``, reusing process-wide state stored under ``key``.
+
+    ``key`` should identify the series (e.g. ticker, period and interval); the indicator
+    parameters are added to it automatically.
+    """
+    full_key = (key, tuple(sorted((k, tuple(v) if isinstance(v, (list, tuple)) else v)
+                                  for k, v in params.items())))
+    with _states_lock:
+        inc = _states.pop(full_key, None) or IncrementalIndicators(**params)
+        _states[full_key] = inc
+        while len(_states) > MAX_STATES:
+            _states.popitem(last=False)
+    with inc.lock:
+        return inc.sync(timestamps, closes)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The dashboard modules are imported flat, as Streamlit does when it runs main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
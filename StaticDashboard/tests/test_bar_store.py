@@ -0,0 +1,37 @@
+import pandas as pd
+
+from bar_store import BarStore
+from market_data import FixtureProvider
+from resample import ResampleEngine
+
+# Tuesday 2026-10-20 before the open; the last two sessions are Fri 10-16 and Mon 10-19
+PRE_MARKET = pd.Timestamp("2026-10-20 08:00", tz="America/New_York")
+
+
+def session_dates(bars):
+    return sorted(set(bars.index().tz_convert("America/New_York").date))
+
+
+def test_store_and_resample_pre_market(tmp_path):
+    store = BarStore(root=str(tmp_path), provider=FixtureProvider(now=PRE_MARKET))
+    snap = store.get_bars(["AAPL"], "2d", "1d")["AAPL"]
+    assert len(snap) == 2
+    assert [str(d) for d in session_dates(snap)] == ["2026-10-16", "2026-10-19"]
+    intraday = ResampleEngine(store).get(["AAPL"], "1d", "15m")["AAPL"]
+    assert not intraday.empty
+    assert [str(d) for d in session_dates(intraday)] == ["2026-10-19"]
+
+
+def test_recent_bars_are_memoized_per_interval(tmp_path, monkeypatch):
+    import bar_store
+    import resample
+
+    engine = ResampleEngine(BarStore(root=str(tmp_path), provider=FixtureProvider()))
+    first = engine.get_recent(["AAPL"], "1y", "1d")
+    assert engine.get_recent(["AAPL"], "1y", "1d") is first
+    # Expires after the interval's refresh time, not the intraday one
+    clock = resample.time.time() + bar_store.INTRADAY_REFRESH_AFTER + 1
+    monkeypatch.setattr(resample.time, "time", lambda: clock)
+    assert engine.get_recent(["AAPL"], "1y", "1d") is first
+    clock += bar_store.REFRESH_AFTER["1d"]
+    assert engine.get_recent(["AAPL"], "1y", "1d") is not first
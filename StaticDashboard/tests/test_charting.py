@@ -0,0 +1,44 @@
+from concurrent.futures import Future
+
+import numpy as np
+
+import charting
+from charting import build_overlays
+from ohlcv import Bars
+
+
+def bars(n):
+    close = 100 + np.arange(n, dtype=np.float64)
+    ts = np.arange(n, dtype=np.int64) * 86_400_000_000_000
+    return Bars.from_arrays(ts, np.column_stack([close, close + 1, close - 1, close, np.full(n, 1e6)]))
+
+
+def test_windows_longer_than_history_are_skipped():
+    opts = {"bollinger": True, "bb_window": 20, "bb_std": 2, "support_resistance": True}
+    overlays, legend = build_overlays("SHORT", "5d", "1d", bars(10), opts, [5, 50], [], [])
+    assert [label for label, _, _ in legend] == ["SMA(5)"]
+    assert not any(np.isnan(values).all() for values, _, _ in overlays)
+
+
+def test_full_history_keeps_every_overlay():
+    opts = {"bollinger": True, "bb_window": 20, "bb_std": 2, "support_resistance": True}
+    _, legend = build_overlays("LONG", "6mo", "1d", bars(60), opts, [5], [], [])
+    assert [label for label, _, _ in legend] == ["SMA(5)", "BB Upper/Lower", "BB SMA", "Support", "Resistance"]
+
+
+class FakePool:
+    def __init__(self):
+        self.shut_down = False
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_cancelled_render_leaves_a_newer_pool_alone(monkeypatch):
+    old, new = FakePool(), FakePool()
+    monkeypatch.setattr(charting, "_render_pool_instance", new)
+    monkeypatch.setattr(charting, "_render_timed", lambda *args: (b"png", 0.0))
+    future = Future()
+    future.cancel()  # what shutting down ``old`` from another session does to its futures
+    assert charting._finish("AAPL", (future, old, (), "key")) == ("AAPL", b"png")
+    assert not new.shut_down and charting._render_pool_instance is new
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from market_data import FixtureProvider, period_offset, period_start
+
+# Tuesday 2026-10-20 before the open; the last two sessions are Fri 10-16 and Mon 10-19
+PRE_MARKET = pd.Timestamp("2026-10-20 08:00", tz="America/New_York")
+
+
+def test_period_start_skips_unopened_session():
+    assert period_start("2d", PRE_MARKET) == pd.Timestamp("2026-10-16", tz="America/New_York")
+    assert period_start("1d", PRE_MARKET + pd.Timedelta(hours=2)) == pd.Timestamp("2026-10-20", tz="America/New_York")
+    # Saturday counts back from Friday
+    assert period_start("1d", pd.Timestamp("2026-10-24 12:00", tz="America/New_York")).day == 23
+
+
+def test_period_offset_counts_sessions_present():
+    # Thanksgiving week: no bar on Thu 11-26
+    idx = pd.DatetimeIndex(["2026-11-23", "2026-11-24", "2026-11-25"], tz="America/New_York")
+    ts = idx.as_unit("ns").asi8
+    assert period_offset(ts, "2d") == 1
+    assert period_offset(ts, "5d") == 0
+    assert period_offset(ts[:0], "2d") == 0
+
+
+def test_fixture_has_no_bar_for_unopened_session():
+    df = FixtureProvider(now=PRE_MARKET).history(["AAPL"], "2d", "1d")["AAPL"]
+    assert [str(d.date()) for d in df.index] == ["2026-10-16", "2026-10-19"]
@@ -0,0 +1,23 @@
+import time
+
+from market_data import FixtureProvider
+from quote_cache import EMPTY_TTL, QuoteCache
+
+
+class FailingProvider(FixtureProvider):
+    def history(self, symbols, period=None, interval="1d", start=None):
+        raise ConnectionError("upstream down")
+
+
+def test_failed_fetch_is_empty_and_expires_soon():
+    cache = QuoteCache(provider=FailingProvider())
+    assert cache.history(["AAPL"], "1d", "15m")["AAPL"].empty
+    expires_at, _ = cache._data[("AAPL", "1d", "15m")]
+    assert expires_at <= time.time() + EMPTY_TTL
+
+
+def test_callers_get_copies():
+    cache = QuoteCache(provider=FixtureProvider())
+    first = cache.history(["AAPL"], "5d", "1d")["AAPL"]
+    first["Close"] = 0.0
+    assert (cache.history(["AAPL"], "5d", "1d")["AAPL"]["Close"] > 0).all()
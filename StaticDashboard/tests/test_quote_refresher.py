@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from market_data import FixtureProvider, clean_ohlcv
+from quote_refresher import QuoteRefresher
+
+
+class FlakyProvider(FixtureProvider):
+    def __init__(self):
+        super().__init__()
+        self.down = False
+        self.empty = False
+
+    def history(self, symbols, period=None, interval="1d", start=None):
+        if self.down:
+            raise ConnectionError("upstream down")
+        if self.empty:
+            return {s: clean_ohlcv(None) for s in symbols}
+        return super().history(symbols, period, interval, start)
+
+
+@pytest.fixture
+def refresher(monkeypatch):
+    r = QuoteRefresher(FlakyProvider())
+    monkeypatch.setattr(r, "_ensure_running", lambda: None)  # refresh by hand
+    return r
+
+
+def test_pages_subscribe_separately(refresher):
+    refresher.subscribe(("s1", "home"), ["SPY"])
+    refresher.subscribe(("s1", "watchlist"), ["AAPL"])
+    assert sorted(refresher.watched()) == ["AAPL", "SPY"]
+
+
+def test_unwatched_symbols_are_evicted(refresher):
+    refresher.subscribe("s1", ["AAPL", "MSFT"])
+    refresher.refresh()
+    refresher.subscribe("s1", ["AAPL"])
+    refresher.refresh()
+    assert set(refresher.snapshot(["AAPL", "MSFT"])) == {"AAPL"}
+    # Watching MSFT again wakes the refresher instead of serving the old row
+    refresher._wake.clear()
+    refresher.subscribe("s1", ["AAPL", "MSFT"])
+    assert refresher._wake.is_set()
+
+
+def test_failed_symbols_do_not_block_readers(refresher):
+    refresher.provider.down = True
+    refresher.subscribe("s1", ["AAPL"])
+    refresher.refresh()
+    start = time.time()
+    assert refresher.snapshot(["AAPL"], wait=5.0) == {}
+    assert time.time() - start < 1
+    refresher.provider.down = False
+    refresher.refresh()
+    assert refresher.snapshot(["AAPL"])["AAPL"]["Close"] is not None
+
+
+def test_empty_frames_keep_the_last_rows(refresher):
+    refresher.subscribe("s1", ["SPY"])
+    refresher.refresh()
+    good = refresher.snapshot(["SPY"])["SPY"]
+    refresher.provider.empty = True
+    refresher.subscribe("s1", ["SPY", "QQQ"])
+    refresher.refresh()
+    assert refresher._failed == {"QQQ"}  # SPY kept its last good row
+    start = time.time()
+    assert refresher.snapshot(["SPY", "QQQ"], wait=5.0) == {"SPY": good}
+    assert time.time() - start < 1
+
+
+def test_stop_ends_the_thread():
+    r = QuoteRefresher(FlakyProvider())
+    r.subscribe("s1", ["AAPL"])
+    r.stop()
+    assert not r._thread.is_alive()
@@ -0,0 +1,18 @@
+import os
+
+from render_cache import RenderCache
+
+
+def test_disk_tier_scans_only_when_over_the_limit(tmp_path, monkeypatch):
+    cache = RenderCache(disk_dir=str(tmp_path), disk_max_bytes=250)
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: scans.append(path) or listdir(path))
+    for i in range(2):
+        cache.put(f"k{i}", b"x" * 100)
+    cache.put("k0", b"x" * 100)  # overwriting doesn't grow the tier
+    assert scans == []
+    cache.put("k2", b"x" * 100)
+    assert len(scans) == 1
+    assert sorted(os.listdir(tmp_path)) == ["k0.png", "k2.png"]
+    assert cache._disk_bytes == 200
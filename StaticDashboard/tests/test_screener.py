@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener import crossover, ema_tail, fetch_universe, screen, sma_tail
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(1)
+    x = (100 * np.exp(np.cumsum(rng.normal(0, 0.02, (260, 40)), axis=0))).astype(np.float32)
+    x[:120, 3] = np.nan  # listed later than the rest
+    return x
+
+
+def test_moving_averages_match_pandas(close):
+    df = pd.DataFrame(close.astype(np.float64))
+    np.testing.assert_allclose(sma_tail(close, 20, 6), df.rolling(20).mean().to_numpy()[-6:], rtol=1e-9)
+    ema = ema_tail(close, [10, 30], 6)
+    for row, span in enumerate((10, 30)):
+        np.testing.assert_allclose(ema[row], df.ewm(span=span, adjust=False).mean().to_numpy()[-6:], rtol=1e-9)
+
+
+def test_screen_matches_per_symbol_pandas(close):
+    out = screen(close, [f"S{i}" for i in range(close.shape[1])], change_bars=20)
+    for j in (0, 3, 17):
+        s = pd.Series(close[:, j].astype(np.float64)).dropna()
+        mid, std = s.rolling(20).mean().iloc[-1], s.rolling(20).std().iloc[-1]
+        row = out.iloc[j]
+        assert row["% Change"] == pytest.approx((s.iloc[-1] / s.iloc[-2] - 1) * 100)
+        assert row["% Change (N bars)"] == pytest.approx((s.iloc[-1] / s.iloc[-21] - 1) * 100)
+        assert row["Bollinger %B"] == pytest.approx((s.iloc[-1] - (mid - 2 * std)) / (4 * std))
+        assert row["Support %"] == pytest.approx((s.iloc[-1] - s.iloc[-30:].min()) / s.iloc[-1] * 100)
+        assert row["Resistance %"] == pytest.approx((s.iloc[-30:].max() - s.iloc[-1]) / s.iloc[-1] * 100)
+        # Crossover direction agrees with the last change of side in pandas' lines
+        side = np.sign(s.rolling(20).mean() - s.rolling(50).mean()).iloc[-6:].to_numpy()
+        changes = np.flatnonzero(side[1:] != side[:-1])
+        expected = {1: "Bullish", -1: "Bearish"}[int(side[-1])] if len(changes) else ""
+        assert row["SMA cross"] == expected
+
+
+def test_touch_is_not_a_cross():
+    slow = np.ones((3, 1))
+    assert crossover(np.array([[2.0], [1.0], [2.0]]), slow)[0][0] == 0
+    direction, bars_ago = crossover(np.array([[2.0], [1.0], [0.5]]), slow)
+    assert (direction[0], bars_ago[0]) == (-1, 0)
+
+
+def test_columns_do_not_depend_on_parameters(close):
+    symbols = [f"S{i}" for i in range(close.shape[1])]
+    assert list(screen(close, symbols)) == list(screen(close, symbols, sma=(5, 60), ema=(20, 40), change_bars=5))
+
+
+def test_universe_is_fetched_in_chunks():
+    class Store:
+        calls = []
+
+        def get_bars(self, symbols, period, interval):
+            self.calls.append(len(symbols))
+            return dict.fromkeys(symbols)
+
+    out = fetch_universe([f"S{i}" for i in range(450)], "1y", store=Store(), chunk_size=200)
+    assert len(out) == 450 and Store.calls == [200, 200, 50]
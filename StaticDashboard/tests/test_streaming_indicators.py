@@ -0,0 +1,61 @@
+import numpy as np
+
+from streaming_indicators import IncrementalIndicators
+
+PARAMS = dict(sma=[5, 20], ema=[10], hma=[9], bb_window=20, bb_std=2.0, sr_window=30)
+
+
+def closes(n, seed=0):
+    return 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n)))
+
+
+def test_sync_result_survives_later_syncs():
+    x = closes(200)
+    ts = np.arange(len(x), dtype=np.int64)
+    inc = IncrementalIndicators(**PARAMS)
+    first = inc.sync(ts, x)
+    before = {k: v.copy() for k, v in first.items()}
+    # Another session moves the forming bar, then the next bar commits over its row
+    inc.sync(ts, np.r_[x[:-1], x[-1] * 1.05])
+    inc.sync(np.r_[ts, len(x)], np.r_[x[:-1], x[-1] * 1.02, x[-1]])
+    for key, value in before.items():
+        np.testing.assert_array_equal(first[key], value)
+
+
+def batch(x):
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    from indicators import compute_indicators
+
+    out = compute_indicators(x, sma=PARAMS["sma"], ema=PARAMS["ema"], hma=PARAMS["hma"],
+                             bb_window=PARAMS["bb_window"], bb_std=PARAMS["bb_std"])
+    sr = np.full((2, len(x)), np.nan)
+    windows = sliding_window_view(x, PARAMS["sr_window"])
+    sr[0, PARAMS["sr_window"] - 1:], sr[1, PARAMS["sr_window"] - 1:] = windows.min(axis=1), windows.max(axis=1)
+    out["support_resistance"] = sr
+    return out
+
+
+def test_incremental_matches_batch():
+    x = closes(400, seed=3)
+    ts = np.arange(len(x), dtype=np.int64)
+    inc = IncrementalIndicators(**PARAMS)
+    # Warm up on 300 bars, then advance one bar at a time with a forming bar each step
+    for n in [300] + list(range(301, 401)):
+        got = inc.sync(ts[:n], x[:n])
+    want = batch(x)
+    for key in ("sma", "ema", "hma", "bollinger", "support_resistance"):
+        np.testing.assert_allclose(got[key], want[key], rtol=2e-5, err_msg=key)  # float32 table
+
+
+def test_chart_states_are_keyed_by_period():
+    from charting import build_overlays
+    from ohlcv import Bars
+    from streaming_indicators import _states
+
+    x = closes(300, seed=4)
+    values = np.repeat(x[:, None], 5, axis=1)
+    year, month = Bars.from_arrays(np.arange(300), values), Bars.from_arrays(np.arange(278, 300), values[-22:])
+    for per, bars in (("1y", year), ("1mo", month)):
+        build_overlays("KEYTEST", per, "1d", bars, {}, [5], [], [])
+    assert {key[0] for key in _states if key[0][0] == "KEYTEST"} == {("KEYTEST", "1y", "1d"), ("KEYTEST", "1mo", "1d")}
@@ -0,0 +1,24 @@
+from watchlist_store import WatchlistStore
+
+GOOD = {"Date": "2024-01-02", "Open": 10.0, "Close": 11.0, "% Change": 10.0, "Volume": 100, "Prev Close": 10.0}
+FAILED = dict.fromkeys(GOOD)
+
+
+def test_failed_quote_keeps_last_snapshot():
+    store = WatchlistStore(":memory:")
+    store.save("Tech", ["AAPL"])
+    store.save_snapshots({"AAPL": GOOD})
+    store.save_snapshots({"AAPL": FAILED})
+    (row,) = store.tables()["Tech"]
+    assert row["Date"] == "2024-01-02" and row["Close"] == 11.0
+
+
+def test_unwatched_snapshots_are_pruned():
+    store = WatchlistStore(":memory:")
+    store.save("Tech", ["AAPL", "MSFT"])
+    store.save_snapshots({"AAPL": GOOD, "MSFT": GOOD, "SPY": GOOD})
+    store.remove_symbol("Tech", "MSFT")
+    store.save_snapshots({"AAPL": GOOD})
+    with store._lock:
+        symbols = [s for (s,) in store._db.execute("SELECT symbol FROM snapshots")]
+    assert symbols == ["AAPL"]
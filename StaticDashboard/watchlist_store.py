@@ -0,0 +1,152 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Server-side watchlists in SQLite, so they survive reconnects and restarts.
+# Membership is indexed by symbol, and quote snapshot rows are stored once per
+# symbol (written by the quote refresher after every refresh) and shared by every
+# watchlist that contains it. A page reads all of its tables with one join.
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "watchlists.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlists (
+    id      INTEGER PRIMARY KEY,
+    name    TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    watchlist_id INTEGER NOT NULL REFERENCES watchlists(id) ON DELETE CASCADE,
+    symbol       TEXT NOT NULL,
+    position     INTEGER NOT NULL,
+    PRIMARY KEY (watchlist_id, symbol)
+);
+CREATE INDEX IF NOT EXISTS members_symbol ON members(symbol);
+CREATE TABLE IF NOT EXISTS snapshots (
+    symbol     TEXT PRIMARY KEY,
+    date       TEXT,
+    open       REAL,
+    close      REAL,
+    pct_change REAL,
+    volume     REAL,
+    prev_close REAL,
+    updated    REAL NOT NULL
+);
+"""
+
+# Snapshot columns in the order of the Watchlist page table
+ROW_COLUMNS = {"Date": "date", "Open": "open", "Close": "close", "% Change": "pct_change", "Volume": "volume"}
+
+
+class WatchlistStore:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("DASHBOARD_WATCHLIST_DB", DEFAULT_PATH)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # One connection shared by the script threads and the refresher thread
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA foreign_keys=ON")
+            self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ─── Watchlists ──────────────────────────────────────────────────────────────
+    def watchlists(self) -> dict:
+        """``{name: [symbols]}`` in creation order, symbols in the order they were saved."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT w.name, m.symbol FROM watchlists w LEFT JOIN members m ON m.watchlist_id = w.id "
+                "ORDER BY w.id, m.position").fetchall()
+        out = {}
+        for name, symbol in rows:
+            symbols = out.setdefault(name, [])
+            if symbol is not None:
+                symbols.append(symbol)
+        return out
+
+    def save(self, name, symbols):
+        """Create or replace watchlist ``name``."""
+        symbols = list(dict.fromkeys(symbols))
+        with self._lock, self._db:
+            self._db.execute("INSERT OR IGNORE INTO watchlists (name, created) VALUES (?, ?)", (name, time.time()))
+            (wid,) = self._db.execute("SELECT id FROM watchlists WHERE name = ?", (name,)).fetchone()
+            self._db.execute("DELETE FROM members WHERE watchlist_id = ?", (wid,))
+            self._db.executemany("INSERT INTO members (watchlist_id, symbol, position) VALUES (?, ?, ?)",
+                                 [(wid, s, i) for i, s in enumerate(symbols)])
+
+    def remove_symbol(self, name, symbol):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM members WHERE symbol = ? AND watchlist_id = "
+                             "(SELECT id FROM watchlists WHERE name = ?)", (symbol, name))
+
+    def delete(self, name):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM watchlists WHERE name = ?", (name,))
+
+    def symbols(self) -> list:
+        """Every symbol on any watchlist."""
+        with self._lock:
+            return [s for (s,) in self._db.execute("SELECT DISTINCT symbol FROM members ORDER BY symbol")]
+
+    # ─── Snapshots ───────────────────────────────────────────────────────────────
+    def save_snapshots(self, rows):
+        """Upsert ``{symbol: quote_row}`` (a quote refresher listener).
+
+        Failed quotes (no ``Date``) keep the last good snapshot, and snapshots of
+        symbols no longer on any watchlist are deleted.
+        """
+        now = time.time()
+        params = [(s, r.get("Date"), _num(r.get("Open")), _num(r.get("Close")), _num(r.get("% Change")),
+                   _num(r.get("Volume")), _num(r.get("Prev Close")), now)
+                  for s, r in rows.items() if r.get("Date") is not None]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO snapshots (symbol, date, open, close, pct_change, volume, prev_close, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(symbol) DO UPDATE SET date = excluded.date, "
+                "open = excluded.open, close = excluded.close, pct_change = excluded.pct_change, "
+                "volume = excluded.volume, prev_close = excluded.prev_close, updated = excluded.updated", params)
+            self._db.execute("DELETE FROM snapshots WHERE symbol NOT IN (SELECT symbol FROM members)")
+
+    def tables(self) -> dict:
+        """``{name: [row dicts]}`` for every watchlist, joined with the shared snapshots in one query.
+
+        Symbols without a snapshot yet get ``None`` values.
+        """
+        cols = ", ".join(f"s.{c}" for c in ROW_COLUMNS.values())
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT w.name, m.symbol, {cols} FROM watchlists w "
+                "LEFT JOIN members m ON m.watchlist_id = w.id "
+                "LEFT JOIN snapshots s ON s.symbol = m.symbol ORDER BY w.id, m.position").fetchall()
+        out = {}
+        for name, symbol, *values in rows:
+            table = out.setdefault(name, [])
+            if symbol is not None:
+                table.append({"Ticker": symbol, **dict(zip(ROW_COLUMNS, values))})
+        return out
+
+
+def _num(value):
+    return None if value is None else float(value)
+
+
+_store = None
+_lock = threading.Lock()
+
+
+def get_watchlist_store() -> WatchlistStore:
+    """Process-wide store, registered as a listener on the shared quote refresher."""
+    global _store
+    with _lock:
+        if _store is None:
+            from quote_refresher import get_refresher
+
+            _store = WatchlistStore()
+            get_refresher().add_listener(_store.save_snapshots)
+        return _store
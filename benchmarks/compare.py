@@ -0,0 +1,50 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python benchmarks/compare.py benchmarks/results/base.json benchmarks/results/new.json --threshold 1.2
+
+Exits with status 1 if any benchmark's median got slower than ``threshold`` x the base
+(changes smaller than ``--min-ms`` are treated as noise).
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {(r["group"], r["name"], json.dumps(r["params"], sort_keys=True)): r for r in data["results"]}, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio that counts as a regression")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore changes smaller than this many ms")
+    args = parser.parse_args()
+
+    base, base_data = load(args.base)
+    new, new_data = load(args.new)
+    print(f"base {base_data['environment'].get('commit')}  vs  new {new_data['environment'].get('commit')}")
+    regressions = 0
+    for key in sorted(set(base) & set(new)):
+        group, name, params = key
+        old_s, new_s = base[key]["median_s"], new[key]["median_s"]
+        ratio = new_s / old_s if old_s else float("inf")
+        flag = ""
+        if abs(new_s - old_s) * 1e3 < args.min_ms:
+            pass
+        elif ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / args.threshold:
+            flag = "  faster"
+        print(f"{group:<11} {name:<28} {params:<40} {old_s * 1e3:10.2f} -> {new_s * 1e3:10.2f} ms  x{ratio:5.2f}{flag}")
+    for key in sorted(set(base) ^ set(new)):
+        print(f"{key[0]:<11} {key[1]:<28} {key[2]:<40} only in {'base' if key in base else 'new'}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
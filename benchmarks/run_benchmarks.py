@@ -0,0 +1,298 @@
+"""Offline benchmark suite for StaticDashboard and the visualization scripts.
+
+Everything runs on synthetic data: the dashboard uses the fixture provider with a
+throwaway bar store, and the animation benchmarks use generated result cubes.
+Results are written as JSON so runs can be compared with ``compare.py``.
+
+    python benchmarks/run_benchmarks.py                 # full suite
+    python benchmarks/run_benchmarks.py --quick         # fewer sizes and repeats
+    python benchmarks/run_benchmarks.py --only indicators,render -o before.json
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, "StaticDashboard")
+VISUALIZATIONS = os.path.join(ROOT, "visualizations")
+GROUPS = ("fetch", "indicators", "screener", "render", "pages", "export")
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOG", "META", "TSLA", "JPM", "XOM", "UNH",
+           "V", "PG", "HD", "KO", "PEP", "COST", "AVGO", "ORCL", "CRM", "ADBE"]
+
+
+def measure(fn, repeat, setup=None):
+    """Wall times of ``repeat`` calls of ``fn`` (``setup`` runs untimed before each)."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def quiet(fn, *args):
+    """Call ``fn`` with its prints swallowed (the scripts report progress on stdout)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+class Suite:
+    def __init__(self, quick):
+        self.quick = quick
+        self.results = []
+
+    def record(self, group, name, times, **params):
+        row = {"group": group, "name": name, "params": params, "repeat": len(times),
+               "min_s": min(times), "median_s": statistics.median(times), "mean_s": statistics.fmean(times)}
+        if "frames" in params:
+            row["per_frame_s"] = row["median_s"] / params["frames"]
+        self.results.append(row)
+        label = ", ".join(f"{k}={v}" for k, v in params.items())
+        print(f"{group:<11} {name:<28} {label:<32} median {row['median_s'] * 1e3:10.2f} ms", flush=True)
+
+    @property
+    def repeat(self):
+        return 2 if self.quick else 5
+
+
+# ─── Dashboard setup ─────────────────────────────────────────────────────────────
+def use_fixture_dashboard(store_dir):
+    """Point the dashboard at synthetic data, a private bar store and a private watchlist database."""
+    os.environ["DASHBOARD_PROVIDER"] = "fixture"
+    os.environ["DASHBOARD_BAR_STORE"] = store_dir
+    os.environ["DASHBOARD_WATCHLIST_DB"] = os.path.join(os.path.dirname(store_dir), "watchlists.db")
+    os.environ.pop("DASHBOARD_RENDER_CACHE_DIR", None)
+    if DASHBOARD not in sys.path:
+        sys.path.insert(0, DASHBOARD)
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def reset_dashboard_caches(store_dir=None):
+    """Drop every process-wide cache, thread and worker pool so the next run starts cold."""
+    import bar_store
+    import charting
+    import market_data
+    import quote_cache
+    import quote_refresher
+    import render_cache
+    import resample
+    import streaming_indicators
+    import watchlist_store
+
+    # The refresher thread keeps refreshing (and feeding the watchlist store) until stopped
+    if quote_refresher._refresher is not None:
+        quote_refresher._refresher.stop()
+        quote_refresher._refresher = None
+    # Watchlists are kept (the database is outside store_dir); only the connection is closed
+    if watchlist_store._store is not None:
+        watchlist_store._store.close()
+        watchlist_store._store = None
+    charting._reset_render_pool()
+    charting._styles.clear()
+    market_data._provider = None
+    quote_cache._cache = None
+    render_cache._cache = None
+    resample._engine = None
+    bar_store._store = None
+    with streaming_indicators._states_lock:
+        streaming_indicators._states.clear()
+    if store_dir:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+
+# ─── Benchmarks ──────────────────────────────────────────────────────────────────
+def bench_fetch(suite, store_dir):
+    from bar_store import BarStore
+    from market_data import FixtureProvider
+
+    provider = FixtureProvider()
+    for n in (5, 20) if suite.quick else (5, 20, 100):
+        symbols = [f"{SYMBOLS[i % len(SYMBOLS)]}{i}" for i in range(n)]
+        suite.record("fetch", "provider_history", measure(lambda: provider.history(symbols, "1y", "1d"), suite.repeat),
+                     symbols=n, period="1y", interval="1d")
+        root = os.path.join(store_dir, "fetch")
+        store = BarStore(root=root, provider=provider)
+        suite.record("fetch", "bar_store_cold", measure(lambda: store.get(symbols, "1y", "1d"), suite.repeat,
+                                                        setup=store.clear), symbols=n)
+        store.get(symbols, "1y", "1d")
+        suite.record("fetch", "bar_store_warm", measure(lambda: store.get(symbols, "1y", "1d"), suite.repeat),
+                     symbols=n)
+
+
+def bench_indicators(suite):
+    import numpy as np
+    import pandas as pd
+
+    from indicators import HMA, compute_indicators
+    from streaming_indicators import IndicatorSet
+
+    params = dict(sma=[5, 20, 50], ema=[10, 30], hma=[20, 60], bb_window=20, bb_std=2.0)
+    rng = np.random.default_rng(0)
+    for n in (500, 5_000) if suite.quick else (500, 5_000, 50_000):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        suite.record("indicators", "compute_indicators", measure(lambda: compute_indicators(close, **params),
+                                                                 suite.repeat), bars=n)
+        series = pd.Series(close)
+        suite.record("indicators", "HMA", measure(lambda: HMA(series, 60), suite.repeat), bars=n, period=60)
+        suite.record("indicators", "streaming_warm_up",
+                     measure(lambda: IndicatorSet(**params).warm_up(close), suite.repeat), bars=n)
+
+
+def bench_screener(suite):
+    from market_data import FixtureProvider
+    from ohlcv import Bars
+    from screener import price_matrix, screen
+
+    provider = FixtureProvider()
+    for n in (500,) if suite.quick else (500, 5_000):
+        frames = provider.history([f"S{i:04d}" for i in range(n)], "1y", "1d")
+        bars = {s: Bars.from_frame(df) for s, df in frames.items()}
+        suite.record("screener", "price_matrix", measure(lambda: price_matrix(bars), suite.repeat), symbols=n)
+        _, symbols, close = price_matrix(bars)
+        suite.record("screener", "screen", measure(lambda: screen(close, symbols), suite.repeat), symbols=n,
+                     bars=len(close))
+
+
+def bench_render(suite):
+    from charting import render_args, render_chart
+    from market_data import FixtureProvider
+    from ohlcv import Bars
+
+    provider = FixtureProvider()
+    opts = {"bollinger": True, "bb_window": 20, "bb_std": 2.0, "support_resistance": True}
+    for period in ("6mo", "2y") if suite.quick else ("6mo", "2y", "5y"):
+        bars = Bars.from_frame(provider.history(["AAPL"], period, "1d")["AAPL"])
+        args = render_args("AAPL", period, "1d", bars, opts, [5, 20], [10], [20])
+        suite.record("render", "render_chart", measure(lambda: render_chart(*args), suite.repeat),
+                     bars=len(bars), plotted_bars=len(args[0]))
+
+
+def bench_pages(suite, store_dir):
+    from streamlit.testing.v1 import AppTest
+
+    from watchlist_store import get_watchlist_store
+
+    def page(path, session=None, widgets=()):
+        def run():
+            at = AppTest.from_file(os.path.join(DASHBOARD, path), default_timeout=600)
+            for key, value in (session or {}).items():
+                at.session_state[key] = value
+            at.run()
+            for kind, index, value in widgets:
+                getattr(at.sidebar, kind)[index].select(value).run()
+            if at.exception:
+                raise RuntimeError(f"{path}: {at.exception[0].value}")
+        return run
+
+    cold = lambda: reset_dashboard_caches(store_dir)
+    repeat = 1 if suite.quick else 3
+    suite.record("pages", "home_cold", measure(page("pages/1_Home.py"), repeat, setup=cold))
+    for n in (5, 20):
+        get_watchlist_store().save("Bench", SYMBOLS[:n])
+        suite.record("pages", "watchlist_cold", measure(page("pages/2_Watchlist.py"), repeat, setup=cold), tickers=n)
+        charting = page("pages/3_Charting.py", {"active_sma": [5, 20], "active_ema": [10], "active_hma": [20]},
+                        [("selectbox", 0, "Watchlist"), ("selectbox", 1, "Bench")])
+        suite.record("pages", "charting_watchlist_cold", measure(charting, repeat, setup=cold), tickers=n)
+        suite.record("pages", "charting_watchlist_warm", measure(charting, repeat), tickers=n)
+
+
+def bench_export(suite, work_dir):
+    import numpy as np
+
+    if VISUALIZATIONS not in sys.path:
+        sys.path.insert(0, VISUALIZATIONS)
+    from animated_heatmap_gif import generate_heatmap_data, main as heatmap_gif
+    from result_cube import ResultCube
+
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        rng = np.random.default_rng(0)
+        for frames in (30, 100) if suite.quick else (30, 100, 300):
+            suite.record("export", "generate_heatmap_data", measure(lambda: generate_heatmap_data(frames),
+                                                                    suite.repeat), frames=frames)
+            cube = ResultCube.create(f"bench_{frames}.cube", range(frames), np.linspace(50, 5, 46),
+                                     np.linspace(50, 95, 46), ["return"])
+            cube.data[..., 0] = rng.normal(20, 5, cube.data.shape[:3])
+            cube.flush()
+            suite.record("export", "heatmap_gif_raster", measure(lambda: quiet(heatmap_gif, cube.path), suite.repeat),
+                         frames=frames, grid="46x46")
+            for mode in ("", "--compact=uint8"):
+                cmd = [sys.executable, os.path.join(VISUALIZATIONS, "heatmap_slider.py"), cube.path] + \
+                      ([mode] if mode else [])
+                run = lambda: subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+                suite.record("export", "heatmap_slider_html" + (mode and "_compact"), measure(run, suite.repeat),
+                             frames=frames, grid="46x46")
+    finally:
+        os.chdir(cwd)
+
+
+# ─── Driver ──────────────────────────────────────────────────────────────────────
+def environment():
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "numpy": numpy.__version__, "pandas": pandas.__version__}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repeats")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"comma-separated groups from {', '.join(GROUPS)}")
+    parser.add_argument("-o", "--output", help="JSON output path (default benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+
+    work_dir = tempfile.mkdtemp(prefix="dashboard-bench-")
+    store_dir = os.path.join(work_dir, "bars")
+    use_fixture_dashboard(store_dir)
+    suite = Suite(args.quick)
+    try:
+        if "fetch" in groups:
+            bench_fetch(suite, work_dir)
+        if "indicators" in groups:
+            bench_indicators(suite)
+        if "screener" in groups:
+            bench_screener(suite)
+        if "render" in groups:
+            bench_render(suite)
+        if "pages" in groups:
+            bench_pages(suite, store_dir)
+        if "export" in groups:
+            bench_export(suite, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    env = environment()
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{(env['commit'] or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"environment": env, "quick": args.quick, "results": suite.results}, f, indent=1)
+    print(f"Wrote {len(suite.results)} results to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import numpy as np
+
+from threshold_sweep import METRICS, sweep_pairs
+
+# Coarse-to-fine threshold sweep. The whole (buy, sell) range is evaluated on a
+# coarse lattice, then only cells that touch the current best points or show a
+# steep change across their corners are subdivided and evaluated at the next,
+# finer step. Results live on a finest-resolution index lattice; ``surface``
+# turns them into a dense grid (or a sparse one with NaN gaps) for the renderers.
+
+
+class AdaptiveSurface:
+    """Multi-resolution sweep result over ``buy_range`` x ``sell_range``.
+
+    ``points`` maps fine-lattice indices ``(i, j)`` (buy, sell) to ``{metric: value}``;
+    ``refined`` lists, per level, the ``(i, j, size)`` cells that were subdivided.
+    """
+
+    def __init__(self, buy_range, sell_range, steps):
+        self.buy_range, self.sell_range = tuple(buy_range), tuple(sell_range)
+        self.steps = tuple(steps)
+        self.unit = self.steps[-1]
+        self.ks = [int(round(s / self.unit)) for s in self.steps]  # step sizes in fine-lattice units
+        self.nb = int(round((buy_range[1] - buy_range[0]) / self.unit)) + 1
+        self.ns = int(round((sell_range[1] - sell_range[0]) / self.unit)) + 1
+        if any(abs(k * self.unit - s) > 1e-9 for k, s in zip(self.ks, self.steps)) \
+                or any(a % b for a, b in zip(self.ks, self.ks[1:])) \
+                or (self.nb - 1) % self.ks[0] or (self.ns - 1) % self.ks[0]:
+            raise ValueError("Each step must divide the previous one and the coarse step must divide both ranges")
+        self.points = {}
+        self.refined = []
+
+    @property
+    def buy_axis(self):
+        return self.buy_range[0] + self.unit * np.arange(self.nb)
+
+    @property
+    def sell_axis(self):
+        return self.sell_range[0] + self.unit * np.arange(self.ns)
+
+    def __len__(self):
+        return len(self.points)
+
+    def best(self, metric="sharpe"):
+        """(buy, sell, value) of the best evaluated point."""
+        (i, j), vals = max(self.points.items(), key=lambda kv: np.nan_to_num(kv[1][metric], nan=-np.inf))
+        return self.buy_axis[i], self.sell_axis[j], vals[metric]
+
+    def _lattice(self, i0, j0, size, k, metric):
+        """Values on the spacing-``k`` lattice of one square cell (all evaluated)."""
+        idx = range(0, size + 1, k)
+        return np.array([[self.points[(i0 + a, j0 + b)][metric] for b in idx] for a in idx])
+
+    def surface(self, metric="return", fill=True):
+        """``(sell_values, buy_values, z)`` on the finest lattice, oriented like the other scripts.
+
+        Sell ascends left to right; buy descends top to bottom. With ``fill`` every
+        cell is bilinearly interpolated from the finest level that covers it;
+        otherwise unevaluated cells are NaN.
+        """
+        z = np.full((self.nb, self.ns), np.nan)
+        if fill:
+            k = self.ks[0]
+            coarse = np.array([[self.points[(a, b)][metric] for b in range(0, self.ns, k)]
+                               for a in range(0, self.nb, k)])
+            z = _upsample(coarse, k)
+            for level, cells in enumerate(self.refined, start=1):
+                k = self.ks[level]
+                for i0, j0, size in cells:
+                    z[i0:i0 + size + 1, j0:j0 + size + 1] = _upsample(self._lattice(i0, j0, size, k, metric), k)
+        for (i, j), vals in self.points.items():
+            z[i, j] = vals[metric]
+        return list(self.sell_axis), list(self.buy_axis[::-1]), z[::-1]
+
+
+def _upsample(values, k):
+    """Bilinear upsampling of a lattice by an integer factor ``k`` (corners preserved)."""
+    if k == 1:
+        return values.astype(np.float64)
+    rows, cols = values.shape
+    fine_r, fine_c = np.arange((rows - 1) * k + 1) / k, np.arange((cols - 1) * k + 1) / k
+    tmp = np.array([np.interp(fine_c, np.arange(cols), row) for row in values])
+    return np.array([np.interp(fine_r, np.arange(rows), col) for col in tmp.T]).T
+
+
+def adaptive_sweep(close, buy_range=(5, 50), sell_range=(50, 95), steps=(9, 3, 1), metric="sharpe",
+                   top_k=5, gradient_fraction=0.1, **kwargs):
+    """Sweep ``close`` coarse to fine and return an ``AdaptiveSurface``.
+
+    At each level a cell is subdivided to the next step if one of its corners is
+    among the ``top_k`` best ``metric`` values seen so far, or if the spread of its
+    corner values is in the top ``gradient_fraction`` of the level's cells.
+    ``kwargs`` go to ``threshold_sweep.sweep_pairs`` (RSI window, periods per year).
+    """
+    result = AdaptiveSurface(buy_range, sell_range, steps)
+    ks = result.ks
+
+    def evaluate(keys):
+        keys = [key for key in dict.fromkeys(keys) if key not in result.points]
+        if not keys:
+            return
+        idx = np.array(keys)
+        scores = sweep_pairs(close, result.buy_axis[idx[:, 0]], result.sell_axis[idx[:, 1]], **kwargs)
+        for n, key in enumerate(keys):
+            result.points[key] = {m: float(scores[m][n]) for m in METRICS}
+
+    k = ks[0]
+    evaluate([(i, j) for i in range(0, result.nb, k) for j in range(0, result.ns, k)])
+    cells = [(i, j, k) for i in range(0, result.nb - 1, k) for j in range(0, result.ns - 1, k)]
+    for level in range(1, len(ks)):
+        if not cells:
+            break
+        values = np.nan_to_num([v[metric] for v in result.points.values()], nan=-np.inf)
+        cutoff = np.sort(values)[-min(top_k, len(values))]
+        corners = np.array([[result.points[c][metric] for c in _corners(cell)] for cell in cells])
+        corners = np.nan_to_num(corners, nan=0.0)
+        spread = corners.max(axis=1) - corners.min(axis=1)
+        steep = spread >= np.quantile(spread, 1 - gradient_fraction)
+        chosen = [cell for cell, c, s in zip(cells, corners, steep) if s or c.max() >= cutoff]
+        k = ks[level]
+        evaluate([(i0 + a, j0 + b) for i0, j0, size in chosen
+                  for a in range(0, size + 1, k) for b in range(0, size + 1, k)])
+        result.refined.append(chosen)
+        cells = [(i0 + a, j0 + b, k) for i0, j0, size in chosen for a in range(0, size, k) for b in range(0, size, k)]
+    return result
+
+
+def _corners(cell):
+    i, j, size = cell
+    return (i, j), (i + size, j), (i, j + size), (i + size, j + size)
+
+
+if __name__ == '__main__':
+    import time
+
+    from threshold_sweep import sweep, synthetic_prices
+
+    close = synthetic_prices()
+    start = time.perf_counter()
+    result = adaptive_sweep(close)
+    adaptive_time = time.perf_counter() - start
+    start = time.perf_counter()
+    full = sweep(close, result.buy_axis, result.sell_axis)["sharpe"]
+    full_time = time.perf_counter() - start
+    b, s, value = result.best("sharpe")
+    i, j = np.unravel_index(np.argmax(full), full.shape)
+    print(f"Adaptive: {len(result)} of {full.size} cells in {adaptive_time:.2f}s, best Sharpe {value:.3f} at "
+          f"buy={b:g}, sell={s:g}")
+    print(f"Full grid: {full_time:.2f}s, best Sharpe {full[i, j]:.3f} at buy={result.buy_axis[i]:g}, "
+          f"sell={result.sell_axis[j]:g}")
@@ -0,0 +1,72 @@
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import imageio
+import numpy as np
+import plotly.graph_objects as go
+
+# Frame pipeline for the GIF scripts: static-image export is the slow step, so
+# frames are exported on a process pool straight to PNG bytes and streamed into
+# the writer in order. Only ``max_in_flight`` frames exist at once and nothing is
+# written to a temp folder. Each worker rebuilds the figure once and then only
+# swaps the z data and title per frame.
+
+_fig = None
+
+
+def _init_worker(fig_dict):
+    global _fig
+    _fig = go.Figure(fig_dict)
+
+
+def _export(update):
+    return frame_png(_fig, update)
+
+
+def frame_png(fig, update) -> bytes:
+    """Apply one frame's ``{"z": ..., "title": ...}`` update to ``fig`` and export it as PNG."""
+    fig.data[0].z = np.asarray(update["z"])
+    if update.get("title"):
+        fig.update_layout(title_text=update["title"])
+    return fig.to_image(format="png")
+
+
+def render_frames(fig, updates, workers=None, max_in_flight=None):
+    """Yield RGB(A) arrays for each update in order, exported ``workers`` at a time.
+
+    ``updates`` may be any iterable (e.g. a generator over a memmapped cube); it is
+    consumed only as fast as frames are written.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for update in updates:
+            yield imageio.imread(io.BytesIO(frame_png(fig, update)))
+        return
+    max_in_flight = max_in_flight or 2 * workers
+    pending = deque()
+    # Spawned like the sweep executor's workers, so no plotting state is inherited from the parent
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_init_worker,
+                             initargs=(fig.to_dict(),)) as pool:
+        for update in updates:
+            pending.append(pool.submit(_export, update))
+            if len(pending) >= max_in_flight:
+                yield imageio.imread(io.BytesIO(pending.popleft().result()))
+        while pending:
+            yield imageio.imread(io.BytesIO(pending.popleft().result()))
+
+
+def write_animation(path, frames, duration=0.1, loop=0):
+    """Stream frames into a GIF (or an MP4 when ``path`` ends in .mp4, needs imageio-ffmpeg)."""
+    if path.lower().endswith(".mp4"):
+        writer = imageio.get_writer(path, fps=1.0 / duration)
+    else:
+        writer = imageio.get_writer(path, mode='I', duration=duration, loop=loop)
+    count = 0
+    with writer:
+        for frame in frames:
+            writer.append_data(frame[..., :3] if path.lower().endswith(".mp4") else frame)
+            count += 1
+    return count
@@ -0,0 +1,130 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from plotly.colors import get_colorscale, unlabel_rgb
+
+# Direct NumPy rasterizer for heatmap animations. The axes, tick labels and
+# colorbar are drawn once into a background image; each frame is just the grid
+# pushed through a 256-entry colormap lookup table, scaled to the plot area and
+# pasted in. Frames come out as RGB arrays ready for the GIF writer, with no
+# per-frame figure export.
+
+BACKGROUND = (30, 30, 30)
+TEXT = (230, 230, 230)
+GRID_TEXT = (170, 170, 170)
+
+
+def colormap_lut(name="RdYlGn", size=256):
+    """(size, 3) uint8 table sampling a Plotly colorscale evenly from 0 to 1."""
+    scale = get_colorscale(name)
+    stops = np.array([s for s, _ in scale])
+    colors = np.array([unlabel_rgb(c) if c.startswith("rgb") else _hex(c) for _, c in scale], dtype=float)
+    x = np.linspace(0, 1, size)
+    return np.stack([np.interp(x, stops, colors[:, k]) for k in range(3)], axis=1).round().astype(np.uint8)
+
+
+def _hex(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has only the fixed bitmap font
+        return ImageFont.load_default()
+
+
+def _resize_index(n_cells, n_px):
+    """Cell index for each pixel along one axis (nearest neighbour)."""
+    return np.minimum((np.arange(n_px) + 0.5) * n_cells / n_px, n_cells - 1).astype(np.intp)
+
+
+def _bilinear(z, h, w):
+    """Resample ``z`` to (h, w) by separable linear interpolation between cell centres."""
+    rows, cols = z.shape
+    yi = np.clip((np.arange(h) + 0.5) * rows / h - 0.5, 0, rows - 1)
+    xi = np.clip((np.arange(w) + 0.5) * cols / w - 0.5, 0, cols - 1)
+    y0, x0 = np.floor(yi).astype(np.intp), np.floor(xi).astype(np.intp)
+    y1, x1 = np.minimum(y0 + 1, rows - 1), np.minimum(x0 + 1, cols - 1)
+    fy, fx = (yi - y0)[:, None], (xi - x0)[None, :]
+    top = z[y0][:, x0] * (1 - fx) + z[y0][:, x1] * fx
+    bottom = z[y1][:, x0] * (1 - fx) + z[y1][:, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+class HeatmapRasterizer:
+    """Renders (buy, sell) grids like the Plotly heatmap in ``animated_heatmap_gif.py``.
+
+    Rows are drawn top to bottom in the order of ``buy`` (the reversed y axis of the
+    Plotly version) and columns left to right in the order of ``sell``.
+    """
+
+    def __init__(self, sell, buy, zmin, zmax, width=700, height=500, colorscale="RdYlGn",
+                 interpolation="nearest", xaxis_title="Sell values", yaxis_title="Buy values",
+                 colorbar_title="Return"):
+        self.sell, self.buy = list(sell), list(buy)
+        self.zmin, self.zmax = float(zmin), float(zmax)
+        self.interpolation = interpolation
+        self.lut = colormap_lut(colorscale)
+        self.font, self.title_font = _font(12), _font(17)
+        # Plot area and colorbar geometry, in pixels
+        self.left, self.top, self.right, self.bottom = 80, 50, width - 110, height - 60
+        self.bar = (width - 85, self.top, width - 65, self.bottom)
+        self.background = self._draw_background(width, height, xaxis_title, yaxis_title, colorbar_title)
+        h, w = self.bottom - self.top, self.right - self.left
+        self._rows, self._cols = _resize_index(len(self.buy), h), _resize_index(len(self.sell), w)
+
+    def _draw_background(self, width, height, xaxis_title, yaxis_title, colorbar_title):
+        img = Image.new("RGB", (width, height), BACKGROUND)
+        draw = ImageDraw.Draw(img)
+        w, h = self.right - self.left, self.bottom - self.top
+        # Tick labels at cell centres (thinned to about 10 per axis)
+        for i in range(0, len(self.sell), max(len(self.sell) // 10, 1)):
+            x = self.left + (i + 0.5) * w / len(self.sell)
+            draw.text((x, self.bottom + 6), f"{self.sell[i]:g}", fill=GRID_TEXT, font=self.font, anchor="mt")
+        for i in range(0, len(self.buy), max(len(self.buy) // 10, 1)):
+            y = self.top + (i + 0.5) * h / len(self.buy)
+            draw.text((self.left - 6, y), f"{self.buy[i]:g}", fill=GRID_TEXT, font=self.font, anchor="rm")
+        draw.text(((self.left + self.right) / 2, height - 22), xaxis_title, fill=TEXT, font=self.font, anchor="mm")
+        label = Image.new("RGB", (h, 20), BACKGROUND)
+        ImageDraw.Draw(label).text((h / 2, 10), yaxis_title, fill=TEXT, font=self.font, anchor="mm")
+        img.paste(label.rotate(90, expand=True), (18, self.top))
+        # Colorbar: the lookup table itself, high values at the top
+        x0, y0, x1, y1 = self.bar
+        ramp = self.lut[np.linspace(len(self.lut) - 1, 0, y1 - y0).round().astype(np.intp)]
+        img.paste(Image.fromarray(np.repeat(ramp[:, None, :], x1 - x0, axis=1)), (x0, y0))
+        for frac in np.linspace(0, 1, 6):
+            y = y1 - frac * (y1 - y0)
+            draw.text((x1 + 4, y), f"{self.zmin + frac * (self.zmax - self.zmin):.3g}", fill=GRID_TEXT,
+                      font=self.font, anchor="lm")
+        draw.text(((x0 + x1) / 2, y0 - 8), colorbar_title, fill=TEXT, font=self.font, anchor="mb")
+        return np.asarray(img)
+
+    def colorize(self, z):
+        """(rows, cols) values to RGB through the lookup table, clipped to [zmin, zmax]; NaN is background."""
+        z = np.asarray(z, dtype=np.float64)
+        span = self.zmax - self.zmin or 1.0
+        idx = np.clip((z - self.zmin) / span * (len(self.lut) - 1), 0, len(self.lut) - 1)
+        rgb = self.lut[np.nan_to_num(idx).round().astype(np.intp)]
+        rgb[np.isnan(z)] = BACKGROUND
+        return rgb
+
+    def render(self, z, title=None):
+        """One frame as an (height, width, 3) uint8 array."""
+        z = np.asarray(z, dtype=np.float64)
+        if self.interpolation == "bilinear":
+            cells = self.colorize(_bilinear(z, self.bottom - self.top, self.right - self.left))
+        else:
+            cells = self.colorize(z)[self._rows][:, self._cols]
+        frame = self.background.copy()
+        frame[self.top:self.bottom, self.left:self.right] = cells
+        if title:
+            img = Image.fromarray(frame)
+            ImageDraw.Draw(img).text((self.left, self.top / 2), title, fill=TEXT, font=self.title_font, anchor="lm")
+            frame = np.asarray(img)
+        return frame
+
+    def frames(self, all_returns, title="Return Heatmap"):
+        """Yield a rendered frame per period of a (period, buy, sell) array or lazy cube view."""
+        for i in range(len(all_returns)):
+            yield self.render(all_returns[i], f"{title} - Period {i+1}")
@@ -0,0 +1,131 @@
+import json
+import os
+
+import numpy as np
+
+# On-disk result cube for sweep surfaces: a directory holding ``data.npy`` with
+# shape (period, buy, sell, metric) and ``header.json`` with the axis values.
+# The data is always opened as a memmap, so a script touches only the frames it
+# slices and cubes far larger than RAM can be animated.
+
+FORMAT_VERSION = 1
+
+
+class ResultCube:
+    def __init__(self, path, header, data):
+        self.path = path
+        self.header = header
+        self.data = data  # np.memmap, shape (period, buy, sell, metric)
+        self._ranges = {}
+
+    # ─── Create / open ──────────────────────────────────────────────────────────
+    @classmethod
+    def create(cls, path, periods, buy_values, sell_values, metrics, dtype="float32", attrs=None):
+        """New zero-filled cube (sparse on most filesystems), opened for writing."""
+        os.makedirs(path, exist_ok=True)
+        header = {
+            "version": FORMAT_VERSION,
+            "dtype": np.dtype(dtype).name,
+            "shape": [len(periods), len(buy_values), len(sell_values), len(metrics)],
+            "axes": {
+                "period": [str(p) for p in periods],
+                "buy": [float(b) for b in buy_values],
+                "sell": [float(s) for s in sell_values],
+                "metric": list(metrics),
+            },
+            "attrs": attrs or {},
+        }
+        data = np.lib.format.open_memmap(os.path.join(path, "data.npy"), mode="w+", dtype=dtype,
+                                         shape=tuple(header["shape"]))
+        with open(os.path.join(path, "header.json"), "w") as f:
+            json.dump(header, f, indent=1)
+        return cls(path, header, data)
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        with open(os.path.join(path, "header.json")) as f:
+            header = json.load(f)
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported result cube version: {header.get('version')}")
+        data = np.load(os.path.join(path, "data.npy"), mmap_mode=mode)
+        if list(data.shape) != header["shape"]:
+            raise ValueError(f"Result cube data shape {data.shape} does not match its header")
+        return cls(path, header, data)
+
+    # ─── Axes ──────────────────────────────────────────────────────────────────
+    @property
+    def periods(self):
+        return self.header["axes"]["period"]
+
+    @property
+    def buy(self):
+        return self.header["axes"]["buy"]
+
+    @property
+    def sell(self):
+        return self.header["axes"]["sell"]
+
+    @property
+    def metrics(self):
+        return self.header["axes"]["metric"]
+
+    def __len__(self):
+        return self.header["shape"][0]
+
+    def metric_index(self, metric):
+        return self.metrics.index(metric)
+
+    # ─── Reads and writes ──────────────────────────────────────────────────────
+    def frame(self, period, metric="return"):
+        """One (buy, sell) surface, read from disk on demand."""
+        return np.array(self.data[period, :, :, self.metric_index(metric)], dtype=np.float64)
+
+    def frames(self, metric="return"):
+        """Lazy (period, buy, sell) view; indexing it reads just the requested frames."""
+        return self.data[..., self.metric_index(metric)]
+
+    def write_frame(self, period, grids):
+        """Store ``{metric: (buy, sell) grid}`` for one period (cube must be writable)."""
+        for metric, grid in grids.items():
+            if metric in self.metrics:
+                self.data[period, :, :, self.metric_index(metric)] = grid
+        self._ranges.clear()
+
+    def value_range(self, metric="return", chunk=64):
+        """(min, max) of a metric across every period, scanned ``chunk`` frames at a time."""
+        if metric not in self._ranges:
+            m = self.metric_index(metric)
+            lo, hi = np.inf, -np.inf
+            for i in range(0, len(self), chunk):
+                block = self.data[i:i + chunk, :, :, m]
+                if np.isfinite(block).any():
+                    lo, hi = min(lo, np.nanmin(block)), max(hi, np.nanmax(block))
+            self._ranges[metric] = (float(lo), float(hi))
+        return self._ranges[metric]
+
+    def flush(self):
+        self.data.flush()
+
+
+def save_walk_forward(path, close, buy_values, sell_values, dtype="float32", **kwargs):
+    """Write every walk-forward frame straight into a new cube, one period at a time."""
+    from threshold_sweep import METRICS
+    from walk_forward import num_periods, walk_forward_frames
+
+    n = num_periods(len(close), kwargs.get("window", 252), kwargs.get("step", 21))
+    cube = ResultCube.create(path, range(1, n + 1), buy_values, sell_values, METRICS, dtype=dtype,
+                             attrs={"source": "walk_forward", **kwargs})
+    for i, grids in enumerate(walk_forward_frames(close, buy_values, sell_values, **kwargs)):
+        cube.write_frame(i, grids)
+    cube.flush()
+    return cube
+
+
+def load_surfaces(path, metric="return"):
+    """``(sell, buy, all_returns, zmin, zmax)`` for the animation scripts.
+
+    ``all_returns`` is a lazy memmap view, so frames are read as the scripts index them.
+    """
+    cube = ResultCube.open(path)
+    zmin, zmax = cube.value_range(metric)
+    return cube.sell, cube.buy, cube.frames(metric), zmin, zmax
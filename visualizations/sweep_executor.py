@@ -0,0 +1,172 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from threshold_sweep import METRICS, sweep
+
+# Multi-process executor for universe sweeps (many symbols x buy x sell). The
+# price matrix is copied into shared memory once and every worker maps it
+# read-only, so tasks carry only index ranges. Workers write their shard of the
+# (symbol, buy, sell, metric) result cube in place; with an output path the cube
+# is an .npy memmap and finished shards are recorded next to it so an
+# interrupted run picks up where it stopped.
+
+
+def _attach(name):
+    """Map an existing shared memory block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions register the block again, but spawned workers share the
+    # parent's resource tracker, which releases it once when the parent unlinks
+    return shared_memory.SharedMemory(name=name)
+
+
+# ─── Worker side ────────────────────────────────────────────────────────────────
+_prices = None
+_buy = _sell = None
+_out = None
+_keep = []  # shared memory handles that back the arrays above
+
+
+def _init_worker(prices_spec, buy, sell, out_spec):
+    global _prices, _buy, _sell, _out
+    name, shape = prices_spec
+    shm = _attach(name)
+    _keep.append(shm)
+    _prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _buy, _sell = buy, sell
+    kind, target, shape = out_spec
+    if kind == "shm":
+        shm = _attach(target)
+        _keep.append(shm)
+        _out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    else:
+        _out = np.load(target, mmap_mode="r+")
+
+
+def _run_shard(shard, window, periods_per_year):
+    sym_lo, sym_hi, buy_lo, buy_hi = shard
+    for s in range(sym_lo, sym_hi):
+        close = _prices[s]
+        close = close[~np.isnan(close)]  # shorter histories are NaN-padded at the front
+        if len(close) <= window + 1:
+            _out[s, buy_lo:buy_hi] = np.nan
+            continue
+        result = sweep(close, _buy[buy_lo:buy_hi], _sell, window=window, periods_per_year=periods_per_year)
+        _out[s, buy_lo:buy_hi] = np.stack([result[m] for m in METRICS], axis=-1)
+    if isinstance(_out, np.memmap):
+        _out.flush()
+    return shard
+
+
+# ─── Driver ─────────────────────────────────────────────────────────────────────
+def price_matrix(series):
+    """Stack close series of different lengths into one (symbols, time) array, NaN-padded at the front."""
+    series = [np.asarray(s, dtype=np.float64) for s in series]
+    n = max(len(s) for s in series)
+    out = np.full((len(series), n), np.nan)
+    for i, s in enumerate(series):
+        out[i, n - len(s):] = s
+    return out
+
+
+def make_shards(num_symbols, num_buy, symbols_per_shard=8, buy_per_shard=None):
+    buy_per_shard = buy_per_shard or num_buy
+    return [(s, min(s + symbols_per_shard, num_symbols), b, min(b + buy_per_shard, num_buy))
+            for s in range(0, num_symbols, symbols_per_shard)
+            for b in range(0, num_buy, buy_per_shard)]
+
+
+def print_progress(done, total):
+    print(f"\rSweep: {done}/{total} shards", end="" if done < total else "\n", flush=True)
+
+
+def run_sweep(prices, buy_values, sell_values, out_path=None, workers=None, symbols_per_shard=8,
+              buy_per_shard=None, window=14, periods_per_year=252, progress=print_progress):
+    """Sweep every symbol row of ``prices`` over the buy x sell grid on a process pool.
+
+    Returns an array of shape (symbols, len(buy_values), len(sell_values), len(METRICS)).
+    With ``out_path`` the cube is an .npy memmap on disk and completed shards are
+    listed in ``<out_path>.progress.json``; rerunning the same sweep skips them.
+    ``progress(done, total)`` is called in this process as shards finish.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if prices.ndim == 1:
+        prices = prices[None, :]
+    buy = np.asarray(buy_values, dtype=np.float64)
+    sell = np.asarray(sell_values, dtype=np.float64)
+    shape = (prices.shape[0], len(buy), len(sell), len(METRICS))
+    shards = make_shards(shape[0], len(buy), symbols_per_shard, buy_per_shard)
+    workers = workers or os.cpu_count() or 1
+
+    done, out, out_shm, log_path = set(), None, None, None
+    if out_path:
+        log_path = out_path + ".progress.json"
+        fingerprint = hashlib.sha256(b"".join([prices.tobytes(), buy.tobytes(), sell.tobytes(),
+                                               repr((window, periods_per_year, shards)).encode()])).hexdigest()
+        log = {}
+        if os.path.exists(out_path) and os.path.exists(log_path):
+            with open(log_path) as f:
+                log = json.load(f)
+        if log.get("fingerprint") == fingerprint:
+            done = {tuple(s) for s in log["done"]}
+            out = np.load(out_path, mmap_mode="r+")
+        else:
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=shape)
+            log = {"fingerprint": fingerprint, "done": []}
+        out_spec = ("npy", out_path, shape)
+    else:
+        out_shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+        out = np.ndarray(shape, dtype=np.float64, buffer=out_shm.buf)
+        out_spec = ("shm", out_shm.name, shape)
+
+    todo = [s for s in shards if s not in done]
+    if progress:
+        progress(len(shards) - len(todo), len(shards))
+    price_shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    try:
+        np.ndarray(prices.shape, dtype=np.float64, buffer=price_shm.buf)[:] = prices
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(min(workers, max(len(todo), 1)), mp_context=ctx, initializer=_init_worker,
+                                 initargs=((price_shm.name, prices.shape), buy, sell, out_spec)) as pool:
+            futures = [pool.submit(_run_shard, s, window, periods_per_year) for s in todo]
+            for future in as_completed(futures):
+                done.add(future.result())
+                if log_path:
+                    log["done"] = sorted(done)
+                    with open(log_path + ".tmp", "w") as f:
+                        json.dump(log, f)
+                    os.replace(log_path + ".tmp", log_path)
+                if progress:
+                    progress(len(done), len(shards))
+        if out_shm is not None:
+            return out.copy()
+        out.flush()
+        return out
+    finally:
+        price_shm.close()
+        price_shm.unlink()
+        if out_shm is not None:
+            del out
+            out_shm.close()
+            out_shm.unlink()
+
+
+if __name__ == '__main__':
+    import time
+
+    from threshold_sweep import synthetic_prices
+
+    universe = price_matrix([synthetic_prices(seed=i) for i in range(500)])
+    buy = np.linspace(45, 5, 20)
+    sell = np.linspace(55, 95, 20)
+    start = time.perf_counter()
+    cube = run_sweep(universe, buy, sell)
+    print(f"Swept {cube.shape[0]} symbols x {len(buy) * len(sell)} threshold pairs "
+          f"in {time.perf_counter() - start:.1f}s")
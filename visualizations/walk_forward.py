@@ -0,0 +1,72 @@
+import numpy as np
+
+from threshold_sweep import METRICS, PERIODS_PER_YEAR, bar_stats, metrics_from_sums, rsi, signal_indices
+
+# Walk-forward surfaces for the per-period animations: period k scores every
+# (buy, sell) pair over a rolling evaluation window of bars. The strategy runs
+# continuously over the whole history; only the scored window moves. Each step
+# keeps running position-weighted sums, adding the bars that entered the window
+# and subtracting the ones that left, so a frame costs O(step) bars, not O(window).
+
+
+def _weighted_sums(enter, exit_, stats, lo, hi, chunk=64):
+    """Sum of positions x ``bar_stats`` over rows [lo, hi), shape (buy, sell, 4)."""
+    out = np.zeros((enter.shape[0], exit_.shape[0], stats.shape[1]))
+    for a in range(lo, hi, chunk):
+        b = min(a + chunk, hi)
+        pos = enter[:, None, a:b] > exit_[None, :, a:b]
+        out += pos.astype(np.float64) @ stats[a:b]
+    return out
+
+
+def num_periods(num_bars, window, step):
+    """Number of full evaluation windows in ``num_bars`` closes."""
+    return max((num_bars - 1 - window) // step + 1, 0)
+
+
+def walk_forward_frames(close, buy_values, sell_values, window=252, step=21, rsi_window=14,
+                        periods_per_year=PERIODS_PER_YEAR, resync_every=64):
+    """Yield ``{metric: (buy, sell) grid}`` for each rolling window, one period at a time.
+
+    Window k covers bar returns ``[k * step, k * step + window)``. Running sums are
+    recomputed from scratch every ``resync_every`` periods so float error cannot
+    accumulate over long animations.
+    """
+    stats = bar_stats(close)
+    enter, exit_ = signal_indices(rsi(close, rsi_window), buy_values, sell_values)
+    enter, exit_ = enter[:, :-1], exit_[:, :-1]  # a position at bar t earns stats row t
+    sums = None
+    for k in range(num_periods(len(stats) + 1, window, step)):
+        lo, hi = k * step, k * step + window
+        if sums is None or step >= window or k % resync_every == 0:
+            sums = _weighted_sums(enter, exit_, stats, lo, hi)
+        else:
+            sums += _weighted_sums(enter, exit_, stats, hi - step, hi)
+            sums -= _weighted_sums(enter, exit_, stats, lo - step, lo)
+        yield metrics_from_sums(sums, window, periods_per_year)
+
+
+def walk_forward_cube(close, buy_values, sell_values, metric="return", out=None, **kwargs):
+    """Stack every period's ``metric`` grid into ``out`` (allocated if None), shape (period, buy, sell)."""
+    window, step = kwargs.get("window", 252), kwargs.get("step", 21)
+    shape = (num_periods(len(close), window, step), len(buy_values), len(sell_values))
+    if out is None:
+        out = np.empty(shape)
+    for i, frame in enumerate(walk_forward_frames(close, buy_values, sell_values, **kwargs)):
+        out[i] = frame[metric]
+    return out
+
+
+if __name__ == '__main__':
+    import time
+
+    from threshold_sweep import synthetic_prices
+
+    close = synthetic_prices(num_bars=21 * 1000 + 253)
+    buy = np.linspace(50, 5, 100)
+    sell = np.linspace(50, 95, 100)
+    start = time.perf_counter()
+    for n, frame in enumerate(walk_forward_frames(close, buy, sell), 1):
+        pass
+    print(f"Generated {n} walk-forward {len(buy)}x{len(sell)} frames ({', '.join(METRICS)}) "
+          f"in {time.perf_counter() - start:.1f}s")